@@ -3,21 +3,91 @@ Test fixtures for Public API v1 tests.
 """
 
 import pytest
+from django.core.cache import cache
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
 from apps.authentication.models import User, Tenant
 from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
 from apps.api_keys.models import APIKey
-import secrets
 
 
-@pytest.fixture
-def test_tenant(db):
-    """Create a test tenant."""
+@pytest.fixture(autouse=True, scope='session')
+def fast_hashers():
+    """
+    Swap the slow password hasher for a cheap one in tests.
+    
+    PBKDF2 is deliberately expensive and runs on every create_user(),
+    which dominates the runtime of these tests.
+    """
+    with override_settings(
+        PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(settings):
+    """
+    Run every API test against a private in-process cache.
+    
+    The views cache responses under fixed keys such as
+    config:test-org:test-asset:local, and rows created with bulk_create or
+    rolled back at the end of a test never fire the invalidation signals.
+    LocMemCache keeps tests from seeing each other's entries without a
+    Redis round trip or FLUSHDB per test.
+    """
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'api-v1-tests',
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_test_tenant():
     return Tenant.objects.create(
         name='Test Organization',
         slug='test-org'
     )
 
 
+def _create_test_user(tenant):
+    return User.objects.create_user(
+        email='test@example.com',
+        password='testpass123',
+        tenant=tenant
+    )
+
+
+def _create_api_key(tenant, user, key_material, environment, label):
+    """Create an API key row and attach the raw key as ``key_value``."""
+    key_value, key_hash = key_material
+    
+    api_key = APIKey.objects.create(
+        tenant=tenant,
+        scope='tenant',
+        environment=environment,
+        created_by=user,
+        label=label,
+        key_hash=key_hash,
+        key_prefix=key_value[:16]  # First 16 chars for lookup
+    )
+    
+    # Attach the raw key value for testing
+    api_key.key_value = key_value
+    return api_key
+
+
+@pytest.fixture
+def test_tenant(db):
+    """Create a test tenant."""
+    return _create_test_tenant()
+
+
 @pytest.fixture
 def other_tenant(db):
     """Create another tenant for access control tests."""
@@ -30,142 +100,325 @@ def other_tenant(db):
 @pytest.fixture
 def test_user(db, test_tenant):
     """Create a test user."""
-    return User.objects.create_user(
-        email='test@example.com',
-        password='testpass123',
-        tenant=test_tenant
-    )
+    return _create_test_user(test_tenant)
+
+
+# Deterministic raw keys; tests do not need CSPRNG output. The first 16
+# characters are the lookup prefix, so they must differ between keys.
+TEST_API_KEY_VALUE = "cm_local_" + "A" * 35
+PRODUCTION_API_KEY_VALUE = "cm_prod_" + "B" * 36
+MULTI_ENV_API_KEY_VALUE = "cm_multi_" + "C" * 35
+
+
+@pytest.fixture(scope='session')
+def test_api_key_material():
+    """
+    Raw key and hash for ``test_api_key``.
+    
+    Hashed once per session. The row itself is still created per test so
+    it is rolled back with the rest of the test data.
+    """
+    return TEST_API_KEY_VALUE, APIKey.hash_key(TEST_API_KEY_VALUE)
+
+
+@pytest.fixture(scope='session')
+def production_api_key_material():
+    """Raw key and hash for ``production_api_key``, hashed once per session."""
+    return PRODUCTION_API_KEY_VALUE, APIKey.hash_key(PRODUCTION_API_KEY_VALUE)
+
+
+@pytest.fixture(scope='session')
+def multi_env_api_key_material():
+    """Raw key and hash for ``multi_env_api_key``, hashed once per session."""
+    return MULTI_ENV_API_KEY_VALUE, APIKey.hash_key(MULTI_ENV_API_KEY_VALUE)
 
 
 @pytest.fixture
-def test_api_key(db, test_tenant, test_user):
+def test_api_key(db, test_tenant, test_user, test_api_key_material):
     """Create a test API key."""
-    # Generate a real API key
-    key_value = f"cm_{secrets.token_urlsafe(32)}"
-    
-    # Hash the key
-    key_hash = APIKey.hash_key(key_value)
-    
-    api_key = APIKey.objects.create(
-        tenant=test_tenant,
-        scope='tenant',
-        environment='local',
-        created_by=test_user,
-        label='Test API Key',
-        key_hash=key_hash,
-        key_prefix=key_value[:16]  # First 16 chars for lookup
+    return _create_api_key(
+        test_tenant, test_user, test_api_key_material,
+        environment='local', label='Test API Key'
     )
-    
-    # Attach the raw key value for testing
-    api_key.key_value = key_value
-    return api_key
 
 
 @pytest.fixture
-def production_api_key(db, test_tenant, test_user):
+def production_api_key(db, test_tenant, test_user, production_api_key_material):
     """Create an API key scoped to production environment."""
-    key_value = f"cm_{secrets.token_urlsafe(32)}"
-    key_hash = APIKey.hash_key(key_value)
+    return _create_api_key(
+        test_tenant, test_user, production_api_key_material,
+        environment='production', label='Production API Key'
+    )
+
+
+@pytest.fixture
+def multi_env_api_key(db, test_tenant, test_user, multi_env_api_key_material):
+    """Create a second local-scoped key for cross-environment tests."""
+    return _create_api_key(
+        test_tenant, test_user, multi_env_api_key_material,
+        environment='local', label='Multi-Env API Key'
+    )
+
+
+@pytest.fixture(scope='class')
+def class_db(django_db_setup, django_db_blocker):
+    """
+    Wrap a whole test class in one transaction that is rolled back at the end.
     
-    api_key = APIKey.objects.create(
-        tenant=test_tenant,
-        scope='tenant',
-        environment='production',
-        created_by=test_user,
-        label='Production API Key',
-        key_hash=key_hash,
-        key_prefix=key_value[:16]  # First 16 chars for lookup
+    Class-scoped fixtures built on top of this create their rows once and
+    every test in the class sees them. Each test still runs inside its own
+    savepoint, so this is only for classes whose tests do not write.
+    """
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(scope='class')
+def class_tenant(class_db):
+    """``test_tenant``, created once per class."""
+    return _create_test_tenant()
+
+
+@pytest.fixture(scope='class')
+def class_user(class_tenant):
+    """``test_user``, created once per class."""
+    return _create_test_user(class_tenant)
+
+
+@pytest.fixture(scope='class')
+def class_api_key(class_tenant, class_user, test_api_key_material):
+    """``test_api_key``, created once per class."""
+    return _create_api_key(
+        class_tenant, class_user, test_api_key_material,
+        environment='local', label='Test API Key'
+    )
+
+
+@pytest.fixture(scope='class')
+def class_production_api_key(class_tenant, class_user, production_api_key_material):
+    """``production_api_key``, created once per class."""
+    return _create_api_key(
+        class_tenant, class_user, production_api_key_material,
+        environment='production', label='Production API Key'
     )
+
+
+class AuthedClient(APIClient):
+    """APIClient that sends the given key as ``X-API-Key`` on every request."""
     
-    api_key.key_value = key_value
-    return api_key
+    def __init__(self, key, **kwargs):
+        super().__init__(**kwargs)
+        self.credentials(HTTP_X_API_KEY=key)
 
 
 @pytest.fixture
-def test_asset(db, test_tenant, test_user):
-    """Create a test asset."""
+def client_with_key():
+    """
+    Build a client for an arbitrary raw key.
+    
+    For keys that are not one of the shared fixtures, such as deliberately
+    invalid keys or keys a test creates itself.
+    """
+    return AuthedClient
+
+
+@pytest.fixture(scope='class')
+def api_client():
+    """Unauthenticated API client shared by every test in a class."""
+    return APIClient()
+
+
+@pytest.fixture
+def auth_client(api_client, test_api_key):
+    """Shared client authenticated with ``test_api_key``."""
+    api_client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
+    yield api_client
+    api_client.credentials()
+
+
+@pytest.fixture
+def prod_client(api_client, production_api_key):
+    """Shared client authenticated with ``production_api_key``."""
+    api_client.credentials(HTTP_X_API_KEY=production_api_key.key_value)
+    yield api_client
+    api_client.credentials()
+
+
+@pytest.fixture
+def class_auth_client(api_client, class_api_key):
+    """Shared client authenticated with ``class_api_key``."""
+    api_client.credentials(HTTP_X_API_KEY=class_api_key.key_value)
+    yield api_client
+    api_client.credentials()
+
+
+@pytest.fixture
+def class_prod_client(api_client, class_production_api_key):
+    """Shared client authenticated with ``class_production_api_key``."""
+    api_client.credentials(HTTP_X_API_KEY=class_production_api_key.key_value)
+    yield api_client
+    api_client.credentials()
+
+
+@pytest.fixture
+def assert_max_queries(django_assert_max_num_queries):
+    """
+    Assert that a block runs at most ``n`` queries.
+    
+    Usage:
+        with assert_max_queries(3):
+            client.get(...)
+    """
+    return django_assert_max_num_queries
+
+
+def _create_test_asset(tenant, user):
     return ConfigAsset.objects.create(
-        tenant=test_tenant,
+        tenant=tenant,
         slug='test-asset',
         name='Test Asset',
         description='Test asset for API testing',
-        created_by=test_user
+        created_by=user
     )
 
 
-@pytest.fixture
-def test_config_object(db, test_asset):
-    """Create a test config object."""
+def _create_test_config_object(asset):
     return ConfigObject.objects.create(
-        asset=test_asset,
+        asset=asset,
         name='app_settings',
         object_type='kv',
         description='Application settings'
     )
 
 
+def _create_multiple_assets(tenant, user):
+    return ConfigAsset.objects.bulk_create([
+        ConfigAsset(
+            tenant=tenant,
+            slug=f'asset-{i}',
+            name=f'Asset {i}',
+            description=f'Test asset {i}',
+            created_by=user
+        )
+        for i in range(3)
+    ])
+
+
 @pytest.fixture
-def test_config_values(db, test_config_object):
-    """Create test config values."""
-    values = [
-        ConfigValue.objects.create(
-            config_object=test_config_object,
+def test_asset(db, test_tenant, test_user):
+    """Create a test asset."""
+    return _create_test_asset(test_tenant, test_user)
+
+
+@pytest.fixture
+def test_config_object(db, test_asset):
+    """Create a test config object."""
+    return _create_test_config_object(test_asset)
+
+
+@pytest.fixture(scope='class')
+def class_config_object(class_tenant, class_user):
+    """``test_asset`` with its ``test_config_object``, created once per class."""
+    return _create_test_config_object(_create_test_asset(class_tenant, class_user))
+
+
+def _local_config_values(config_object):
+    return [
+        ConfigValue(
+            config_object=config_object,
             environment='local',
             key='retries',
             value_type='string',
             value_string='3'
         ),
-        ConfigValue.objects.create(
-            config_object=test_config_object,
+        ConfigValue(
+            config_object=config_object,
             environment='local',
             key='theme',
             value_type='string',
             value_string='dark'
         ),
-        ConfigValue.objects.create(
-            config_object=test_config_object,
+        ConfigValue(
+            config_object=config_object,
             environment='local',
             key='timeout',
             value_type='string',
             value_string='30'
         ),
     ]
-    return values
 
 
-@pytest.fixture
-def production_config_values(db, test_config_object):
-    """Create production config values."""
-    values = [
-        ConfigValue.objects.create(
-            config_object=test_config_object,
+def _production_config_values(config_object):
+    return [
+        ConfigValue(
+            config_object=config_object,
             environment='production',
             key='retries',
             value_type='string',
             value_string='5'
         ),
-        ConfigValue.objects.create(
-            config_object=test_config_object,
+        ConfigValue(
+            config_object=config_object,
             environment='production',
             key='theme',
             value_type='string',
             value_string='light'
         ),
     ]
-    return values
+
+
+@pytest.fixture
+def test_config_values(db, test_config_object):
+    """Create test config values."""
+    return ConfigValue.objects.bulk_create(_local_config_values(test_config_object))
+
+
+@pytest.fixture
+def production_config_values(db, test_config_object):
+    """Create production config values."""
+    return ConfigValue.objects.bulk_create(
+        _production_config_values(test_config_object)
+    )
+
+
+@pytest.fixture
+def all_config_values(db, test_config_object):
+    """
+    Create the local and production config values in one insert.
+    
+    For tests that need both environments; returns the rows keyed by
+    environment.
+    """
+    local = _local_config_values(test_config_object)
+    rows = ConfigValue.objects.bulk_create(
+        local + _production_config_values(test_config_object)
+    )
+    return {'local': rows[:len(local)], 'production': rows[len(local):]}
+
+
+@pytest.fixture
+def json_config_values(db, test_config_object):
+    """Create JSON-typed config values."""
+    return ConfigValue.objects.bulk_create([
+        ConfigValue(
+            config_object=test_config_object,
+            environment='local',
+            key='database_config',
+            value_type='json',
+            value_json={'host': 'localhost', 'port': 5432}
+        ),
+    ])
 
 
 @pytest.fixture
 def multiple_assets(db, test_tenant, test_user):
     """Create multiple test assets."""
-    assets = []
-    for i in range(3):
-        asset = ConfigAsset.objects.create(
-            tenant=test_tenant,
-            slug=f'asset-{i}',
-            name=f'Asset {i}',
-            description=f'Test asset {i}',
-            created_by=test_user
-        )
-        assets.append(asset)
-    return assets
+    return _create_multiple_assets(test_tenant, test_user)
+
+
+@pytest.fixture(scope='class')
+def class_multiple_assets(class_tenant, class_user):
+    """``multiple_assets``, created once per class."""
+    return _create_multiple_assets(class_tenant, class_user)
@@ -3,80 +3,86 @@ Tests for assets endpoints.
 """
 
 import pytest
-from django.urls import reverse
-from rest_framework.test import APIClient
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 
-@pytest.mark.django_db
-class TestAssetListView:
-    """Test cases for asset list endpoint."""
+ASSETS_URL = '/api/v1/assets/'
+ASSET_URL_TPL = ASSETS_URL + '{asset}/'
+
+
+@pytest.mark.django_db(transaction=False, reset_sequences=False)
+class TestAssetListViewReadOnly:
+    """Read-only asset list tests sharing one set of rows per class."""
     
     def test_list_assets_success(
         self,
-        test_api_key,
-        multiple_assets
+        class_auth_client,
+        class_multiple_assets
     ):
         """Test listing assets successfully."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get('/api/v1/assets/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = class_auth_client.get(ASSETS_URL)
         
         assert response.status_code == status.HTTP_200_OK
-        assert 'assets' in response.data
-        assert len(response.data['assets']) == 3
+        assert 'assets' in response.json()
+        assert len(response.json()['assets']) == 3
+        
+        # Config objects must never be fetched per asset (N+1)
+        object_queries = [
+            q for q in ctx.captured_queries if 'config_objects' in q['sql'].lower()
+        ]
+        assert len(object_queries) <= 1
         
         # Check structure
-        asset = response.data['assets'][0]
+        asset = response.json()['assets'][0]
         assert 'id' in asset
         assert 'slug' in asset
         assert 'name' in asset
         assert 'description' in asset
     
+    def test_list_assets_no_auth(self, api_client):
+        """Test 403 when no API key provided."""
+        response = api_client.get(ASSETS_URL)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    # test_list_assets_org_not_found removed - org is now derived from API key
+
+
+@pytest.mark.django_db
+class TestAssetListView:
+    """Test cases for asset list endpoint."""
+    
     def test_list_assets_empty(
         self,
-        test_api_key,
+        auth_client,
         test_tenant
     ):
         """Test listing when no assets exist."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get('/api/v1/assets/')
+        response = auth_client.get(ASSETS_URL)
         
         assert response.status_code == status.HTTP_200_OK
-        assert 'assets' in response.data
-        assert len(response.data['assets']) == 0
-    
-    def test_list_assets_no_auth(self):
-        """Test 403 when no API key provided."""
-        client = APIClient()
-        
-        response = client.get('/api/v1/assets/')
-        
-        assert response.status_code == status.HTTP_403_FORBIDDEN
-    
-    # test_list_assets_org_not_found removed - org is now derived from API key
+        assert 'assets' in response.json()
+        assert len(response.json()['assets']) == 0
     
     def test_list_assets_wrong_tenant(
         self,
-        test_api_key,
+        auth_client,
         other_tenant
     ):
         """Test that wrong tenant returns empty list (assets filtered by tenant)."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         # API key's tenant has no assets, so should return empty list
-        response = client.get('/api/v1/assets/')
+        response = auth_client.get(ASSETS_URL)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data['assets']) == 0
+        assert len(response.json()['assets']) == 0
     
     def test_list_assets_ordered_by_name(
         self,
-        test_api_key,
+        auth_client,
         test_tenant,
         test_user
     ):
@@ -84,51 +90,75 @@ class TestAssetListView:
         from apps.config_assets.models import ConfigAsset
         
         # Create assets in random order
+        ConfigAsset.objects.bulk_create([
+            ConfigAsset(tenant=test_tenant, slug='zebra', name='Zebra Asset', created_by=test_user),
+            ConfigAsset(tenant=test_tenant, slug='alpha', name='Alpha Asset', created_by=test_user),
+            ConfigAsset(tenant=test_tenant, slug='beta', name='Beta Asset', created_by=test_user),
+        ])
+        
+        response = auth_client.get(ASSETS_URL)
+        
+        assert response.status_code == status.HTTP_200_OK
+        names = [asset['name'] for asset in response.json()['assets']]
+        assert names == ['Alpha Asset', 'Beta Asset', 'Zebra Asset']
+    
+    def test_list_assets_cache_invalidated_on_create(
+        self,
+        auth_client,
+        test_tenant,
+        test_user
+    ):
+        """Test that creating an asset drops the cached list."""
+        from apps.config_assets.models import ConfigAsset
+        
+        response = auth_client.get(ASSETS_URL)
+        assert response.json()['assets'] == []
+        assert cache.get('assets:test-org') is not None
+        
         ConfigAsset.objects.create(
-            tenant=test_tenant,
-            slug='zebra',
-            name='Zebra Asset',
-            created_by=test_user
-        )
-        ConfigAsset.objects.create(
-            tenant=test_tenant,
-            slug='alpha',
-            name='Alpha Asset',
-            created_by=test_user
-        )
-        ConfigAsset.objects.create(
-            tenant=test_tenant,
-            slug='beta',
-            name='Beta Asset',
-            created_by=test_user
+            tenant=test_tenant, slug='new-asset', name='New Asset', created_by=test_user
         )
         
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
+        response = auth_client.get(ASSETS_URL)
+        assert [a['slug'] for a in response.json()['assets']] == ['new-asset']
+    
+    def test_list_assets_conditional_get(
+        self,
+        auth_client,
+        test_tenant,
+        test_user
+    ):
+        """Test 304 for a matching ETag, and a new ETag once the list changes."""
+        from apps.config_assets.models import ConfigAsset
+        
+        response = auth_client.get(ASSETS_URL)
+        etag = response['ETag']
+        
+        response = auth_client.get(ASSETS_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
         
-        response = client.get('/api/v1/assets/')
+        ConfigAsset.objects.create(
+            tenant=test_tenant, slug='new-asset', name='New Asset', created_by=test_user
+        )
         
+        response = auth_client.get(ASSETS_URL, HTTP_IF_NONE_MATCH=etag)
         assert response.status_code == status.HTTP_200_OK
-        names = [asset['name'] for asset in response.data['assets']]
-        assert names == ['Alpha Asset', 'Beta Asset', 'Zebra Asset']
+        assert response['ETag'] != etag
 
 
-@pytest.mark.django_db
-class TestAssetDetailView:
-    """Test cases for asset detail endpoint."""
+@pytest.mark.django_db(transaction=False, reset_sequences=False)
+class TestAssetDetailViewReadOnly:
+    """Read-only asset detail tests sharing one set of rows per class."""
     
     def test_get_asset_success(
         self,
-        test_api_key,
-        test_asset,
-        test_config_object
+        class_auth_client,
+        class_config_object
     ):
         """Test getting asset details successfully."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/'
+        response = class_auth_client.get(
+            ASSET_URL_TPL.format(asset='test-asset')
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -140,33 +170,55 @@ class TestAssetDetailView:
     
     def test_get_asset_not_found(
         self,
-        test_api_key,
-        test_tenant
+        class_auth_client
     ):
         """Test 404 when asset doesn't exist."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/nonexistent/'
+        response = class_auth_client.get(
+            ASSET_URL_TPL.format(asset='nonexistent')
         )
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert 'error' in response.data
     
-    def test_get_asset_no_auth(self, test_asset):
+    def test_get_asset_no_auth(self, class_config_object, api_client):
         """Test 403 when no API key provided."""
-        client = APIClient()
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/'
+        response = api_client.get(
+            ASSET_URL_TPL.format(asset='test-asset')
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
     
+    def test_get_asset_response_structure(
+        self,
+        class_auth_client,
+        class_config_object
+    ):
+        """Test asset response has correct structure."""
+        response = class_auth_client.get(
+            ASSET_URL_TPL.format(asset='test-asset')
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        
+        # Check asset fields
+        required_fields = {'id', 'slug', 'name', 'description', 'objects'}
+        missing = required_fields - response.data.keys()
+        assert not missing, f"Missing fields: {missing}"
+        
+        # Check object fields
+        obj = response.data['objects'][0]
+        object_fields = {'id', 'name', 'type', 'description'}
+        missing = object_fields - obj.keys()
+        assert not missing, f"Missing fields: {missing}"
+
+
+@pytest.mark.django_db
+class TestAssetDetailView:
+    """Test cases for asset detail endpoint."""
+    
     def test_get_asset_wrong_tenant(
         self,
-        test_api_key,
+        auth_client,
         other_tenant,
         test_user
     ):
@@ -181,11 +233,8 @@ class TestAssetDetailView:
             created_by=test_user
         )
         
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/other-asset/'
+        response = auth_client.get(
+            ASSET_URL_TPL.format(asset='other-asset')
         )
         
         # Asset not found in this tenant returns 404 (not 403)
@@ -193,29 +242,20 @@ class TestAssetDetailView:
     
     def test_get_asset_with_multiple_objects(
         self,
-        test_api_key,
+        auth_client,
         test_asset
     ):
         """Test getting asset with multiple config objects."""
         from apps.config_assets.models import ConfigObject
         
         # Create multiple config objects
-        ConfigObject.objects.create(
-            asset=test_asset,
-            name='database',
-            object_type='kv'
-        )
-        ConfigObject.objects.create(
-            asset=test_asset,
-            name='stripe',
-            object_type='kv'
-        )
-        
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
+        ConfigObject.objects.bulk_create([
+            ConfigObject(asset=test_asset, name='database', object_type='kv'),
+            ConfigObject(asset=test_asset, name='stripe', object_type='kv'),
+        ])
         
-        response = client.get(
-            '/api/v1/assets/test-asset/'
+        response = auth_client.get(
+            ASSET_URL_TPL.format(asset='test-asset')
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -225,29 +265,21 @@ class TestAssetDetailView:
         names = [obj['name'] for obj in response.data['objects']]
         assert names == ['database', 'stripe']
     
-    def test_get_asset_response_structure(
+    def test_get_asset_etag_changes_with_objects(
         self,
-        test_api_key,
-        test_asset,
+        auth_client,
         test_config_object
     ):
-        """Test asset response has correct structure."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/'
-        )
+        """Test the ETag changes when the asset's objects change."""
+        url = ASSET_URL_TPL.format(asset='test-asset')
+        etag = auth_client.get(url)['ETag']
         
-        assert response.status_code == status.HTTP_200_OK
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
         
-        # Check asset fields
-        required_fields = ['id', 'slug', 'name', 'description', 'objects']
-        for field in required_fields:
-            assert field in response.data
+        test_config_object.name = 'renamed'
+        test_config_object.save()
         
-        # Check object fields
-        obj = response.data['objects'][0]
-        object_fields = ['id', 'name', 'type', 'description']
-        for field in object_fields:
-            assert field in obj
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['objects'][0]['name'] == 'renamed'
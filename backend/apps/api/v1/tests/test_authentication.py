@@ -0,0 +1,104 @@
+"""
+Tests for API key authentication.
+"""
+
+import bcrypt
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from apps.api_keys.models import APIKey
+
+
+LEGACY_API_KEY_VALUE = "cm_legacy_" + "D" * 34
+
+
+@pytest.mark.django_db
+class TestAPIKeyHashing:
+    """Test cases for API key hashing and legacy hash upgrades."""
+    
+    def test_hash_key_is_deterministic(self):
+        """Test the same raw key always hashes to the same value."""
+        assert APIKey.hash_key('cm_abc') == APIKey.hash_key('cm_abc')
+        assert APIKey.hash_key('cm_abc') != APIKey.hash_key('cm_abd')
+    
+    def test_legacy_bcrypt_key_is_upgraded(self, test_tenant, test_user, client_with_key):
+        """Test a bcrypt-hashed key still authenticates and is rehashed."""
+        legacy_hash = bcrypt.hashpw(
+            LEGACY_API_KEY_VALUE.encode(), bcrypt.gensalt(rounds=4)
+        ).decode()
+        api_key = APIKey.objects.create(
+            tenant=test_tenant,
+            created_by=test_user,
+            label='Legacy Key',
+            key_hash=legacy_hash,
+            key_prefix=LEGACY_API_KEY_VALUE[:16]
+        )
+        
+        response = client_with_key(LEGACY_API_KEY_VALUE).get('/api/v1/me/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        api_key.refresh_from_db()
+        assert not api_key.has_legacy_hash
+        assert api_key.key_hash == APIKey.hash_key(LEGACY_API_KEY_VALUE)
+    
+    def test_wrong_key_with_matching_prefix(self, test_api_key, client_with_key):
+        """Test a key sharing the lookup prefix but not the secret is rejected."""
+        wrong_key = test_api_key.key_value[:16] + 'x' * 28
+        
+        response = client_with_key(wrong_key).get('/api/v1/me/')
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestAPIKeyCache:
+    """Test cases for the verified-key cache."""
+    
+    def test_cached_key_skips_lookup(self, auth_client, django_assert_num_queries):
+        """Test a second request with the same key does not query api_keys."""
+        auth_client.get('/api/v1/me/')
+        
+        # Only the tenant context resets remain
+        with django_assert_num_queries(2):
+            response = auth_client.get('/api/v1/me/')
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_revoked_key_rejected_after_caching(self, auth_client, test_api_key):
+        """Test revoking a key drops its cached entry."""
+        assert auth_client.get('/api/v1/me/').status_code == status.HTTP_200_OK
+        
+        test_api_key.revoked = True
+        test_api_key.save(update_fields=['revoked'])
+        
+        response = auth_client.get('/api/v1/me/')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestAPIKeyLastUsed:
+    """Test cases for buffered last use tracking."""
+    
+    def test_request_buffers_last_use(self, auth_client, test_api_key):
+        """Test a request records last use in the cache, not the database."""
+        from apps.api_keys.authentication import last_used_cache_key
+        
+        auth_client.get('/api/v1/me/')
+        auth_client.get('/api/v1/me/')
+        
+        assert cache.get(last_used_cache_key(test_api_key.id)) is not None
+        test_api_key.refresh_from_db()
+        assert test_api_key.last_used_at is None
+    
+    def test_flush_writes_buffered_last_use(self, auth_client, test_api_key):
+        """Test the flush stores buffered times once and skips unchanged keys."""
+        from apps.api_keys.authentication import last_used_cache_key
+        from apps.api_keys.tasks import flush_last_used
+        
+        auth_client.get('/api/v1/me/')
+        
+        assert flush_last_used() == 1
+        test_api_key.refresh_from_db()
+        assert test_api_key.last_used_at == cache.get(last_used_cache_key(test_api_key.id))
+        
+        assert flush_last_used() == 0
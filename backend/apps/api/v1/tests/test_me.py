@@ -3,20 +3,21 @@ Tests for API key metadata endpoint.
 """
 
 import pytest
-from rest_framework.test import APIClient
 from rest_framework import status
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=False, reset_sequences=False)
 class TestAPIKeyMetadataView:
-    """Test cases for API key metadata endpoint."""
+    """
+    Test cases for API key metadata endpoint.
+    
+    None of these tests write, so the tenant, user and keys are created
+    once for the whole class.
+    """
     
-    def test_get_metadata_success(self, test_api_key):
+    def test_get_metadata_success(self, class_auth_client):
         """Test getting API key metadata successfully."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get('/api/v1/me/')
+        response = class_auth_client.get('/api/v1/me/')
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['organization'] == 'test-org'
@@ -25,45 +26,98 @@ class TestAPIKeyMetadataView:
         assert response.data['label'] == 'Test API Key'
         assert 'asset' not in response.data  # Tenant-scoped, no asset
     
-    def test_get_metadata_production_key(self, production_api_key):
-        """Test metadata for production-scoped key."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=production_api_key.key_value)
+    def test_get_metadata_query_count(self, class_auth_client, assert_max_queries):
+        """Test key lookup loads tenant and user in the same query."""
+        # Tenant context resets + one API key lookup
+        with assert_max_queries(3):
+            response = class_auth_client.get('/api/v1/me/')
         
-        response = client.get('/api/v1/me/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['organization'] == 'test-org'
+    
+    def test_get_metadata_production_key(self, class_prod_client):
+        """Test metadata for production-scoped key."""
+        response = class_prod_client.get('/api/v1/me/')
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['organization'] == 'test-org'
         assert response.data['environment'] == 'production'
         assert response.data['scope'] == 'tenant'
     
-    def test_get_metadata_no_auth(self):
+    def test_get_metadata_no_auth(self, api_client):
         """Test 403 when no API key provided."""
-        client = APIClient()
-        
-        response = client.get('/api/v1/me/')
+        response = api_client.get('/api/v1/me/')
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
     
-    def test_get_metadata_invalid_key(self):
+    def test_get_metadata_invalid_key(self, client_with_key):
         """Test 403 when invalid API key provided."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY='invalid_key')
+        client = client_with_key('invalid_key')
         
         response = client.get('/api/v1/me/')
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
     
-    def test_get_metadata_response_structure(self, test_api_key):
+    def test_get_metadata_response_structure(self, class_auth_client):
         """Test response has correct structure."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get('/api/v1/me/')
+        response = class_auth_client.get('/api/v1/me/')
         
         assert response.status_code == status.HTTP_200_OK
         
         # Check required fields
-        required_fields = ['organization', 'environment', 'scope', 'label']
-        for field in required_fields:
-            assert field in response.data, f"Missing field: {field}"
+        required_fields = {'organization', 'environment', 'scope', 'label'}
+        missing = required_fields - response.data.keys()
+        assert not missing, f"Missing fields: {missing}"
+
+
+@pytest.mark.django_db
+class TestAPIKeyMetadataRefresh:
+    """Test cases for the denormalized /me/ payload."""
+    
+    def test_get_metadata_reflects_key_change(self, auth_client, test_api_key):
+        """Test that saving the key rebuilds its metadata."""
+        test_api_key.label = 'Renamed Key'
+        test_api_key.save(update_fields=['label'])
+        
+        response = auth_client.get('/api/v1/me/')
+        assert response.data['label'] == 'Renamed Key'
+    
+    def test_get_metadata_reflects_tenant_slug_change(self, auth_client, test_tenant):
+        """Test that renaming the tenant refreshes its keys' metadata."""
+        test_tenant.slug = 'renamed-org'
+        test_tenant.save()
+        
+        response = auth_client.get('/api/v1/me/')
+        assert response.data['organization'] == 'renamed-org'
+    
+    def test_get_metadata_asset_scoped_key(
+        self,
+        client_with_key,
+        test_asset,
+        test_api_key
+    ):
+        """Test asset-scoped keys report, and follow, their asset's slug."""
+        test_api_key.scope = 'asset'
+        test_api_key.asset = test_asset
+        test_api_key.save()
+        client = client_with_key(test_api_key.key_value)
+        
+        response = client.get('/api/v1/me/')
+        assert response.data['asset'] == 'test-asset'
+        
+        test_asset.slug = 'renamed-asset'
+        test_asset.save()
+        
+        response = client.get('/api/v1/me/')
+        assert response.data['asset'] == 'renamed-asset'
+    
+    def test_get_metadata_key_without_creator(self, auth_client, test_api_key):
+        """Test a key keeps working after its creator is removed."""
+        # created_by is SET_NULL, so the key authenticates with no user
+        test_api_key.created_by = None
+        test_api_key.save(update_fields=['created_by'])
+        
+        response = auth_client.get('/api/v1/me/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['organization'] == 'test-org'
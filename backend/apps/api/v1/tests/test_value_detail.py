@@ -3,33 +3,28 @@ Tests for granular config value endpoint.
 """
 
 import pytest
-from django.urls import reverse
-from rest_framework.test import APIClient
 from rest_framework import status
 from django.core.cache import cache
 
 
+ASSETS_URL = '/api/v1/assets/'
+VALUE_URL_TPL = ASSETS_URL + '{asset}/objects/{obj}/values/{key}/'
+
+
 @pytest.mark.django_db
 class TestConfigValueDetailView:
     """Test cases for granular config value endpoint."""
     
-    def setup_method(self):
-        """Clear cache before each test."""
-        cache.clear()
-    
     def test_get_specific_value_success(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test getting a specific config value successfully."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/',
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries'),
             {'environment': 'local'}
         )
         
@@ -42,18 +37,15 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_default_environment(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test that 'local' is the default environment."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         # Don't specify environment
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/theme/'
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='theme')
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -62,27 +54,13 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_json_type(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
-        test_config_object
+        json_config_values
     ):
         """Test getting JSON type value."""
-        from apps.config_assets.models import ConfigValue
-        
-        # Create JSON value
-        ConfigValue.objects.create(
-            config_object=test_config_object,
-            environment='local',
-            key='database_config',
-            value_type='json',
-            value_json={'host': 'localhost', 'port': 5432}
-        )
-        
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/database_config/',
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='database_config'),
             {'environment': 'local'}
         )
         
@@ -95,15 +73,12 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_asset_not_found(
         self,
-        test_api_key,
+        auth_client,
         test_tenant
     ):
         """Test 404 when asset doesn't exist."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/nonexistent/objects/app_settings/values/retries/'
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='nonexistent', obj='app_settings', key='retries')
         )
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -111,15 +86,12 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_object_not_found(
         self,
-        test_api_key,
+        auth_client,
         test_asset
     ):
         """Test 404 when config object doesn't exist."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/nonexistent/values/retries/'
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='nonexistent', key='retries')
         )
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -128,17 +100,14 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_key_not_found(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test 404 when key doesn't exist."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/nonexistent_key/'
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='nonexistent_key')
         )
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -147,18 +116,15 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_wrong_environment(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test 403 when key doesn't exist in specified environment or API key scope prevents access."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         # Try to get local value from production environment
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/',
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries'),
             {'environment': 'production'}
         )
         
@@ -168,7 +134,7 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_wrong_tenant(
         self,
-        test_api_key,
+        auth_client,
         other_tenant,
         test_user
     ):
@@ -197,11 +163,8 @@ class TestConfigValueDetailView:
             value_string='value'
         )
         
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/other-asset/objects/settings/values/test/'
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='other-asset', obj='settings', key='test')
         )
         
         # Asset not found in this tenant returns 404 (not 403)
@@ -210,18 +173,15 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_environment_scope(
         self,
-        production_api_key,
+        prod_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test 403 when API key is scoped to different environment."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=production_api_key.key_value)
-        
         # Try to access 'local' environment with production-scoped key
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/',
+        response = prod_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries'),
             {'environment': 'local'}
         )
         
@@ -229,42 +189,37 @@ class TestConfigValueDetailView:
         assert 'error' in response.data
         assert 'environment' in response.data['error'].lower()
     
-    def test_get_specific_value_no_auth(self, test_asset):
+    def test_get_specific_value_no_auth(self, test_asset, api_client):
         """Test 403 when no API key provided."""
-        client = APIClient()
         # No credentials
         
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/'
+        response = api_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries')
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
     
-    def test_get_specific_value_invalid_api_key(self, test_asset):
+    def test_get_specific_value_invalid_api_key(self, test_asset, client_with_key):
         """Test 403 when invalid API key provided."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY='invalid_key')
+        client = client_with_key('invalid_key')
         
         response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/'
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries')
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
     
     def test_get_specific_value_caching(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test that responses are cached."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         # First request
-        response1 = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/',
+        response1 = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries'),
             {'environment': 'local'}
         )
         
@@ -272,11 +227,11 @@ class TestConfigValueDetailView:
         cache_key = 'config:test-org:test-asset:app_settings:retries:local'
         cached_data = cache.get(cache_key)
         assert cached_data is not None
-        assert cached_data['value'] == '3'
+        assert cached_data['data']['value'] == '3'
         
         # Second request should hit cache
-        response2 = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/retries/',
+        response2 = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='retries'),
             {'environment': 'local'}
         )
         
@@ -284,30 +239,29 @@ class TestConfigValueDetailView:
     
     def test_get_specific_value_response_structure(
         self,
-        test_api_key,
+        auth_client,
         test_asset,
         test_config_object,
         test_config_values
     ):
         """Test response has correct structure."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
-        response = client.get(
-            '/api/v1/assets/test-asset/objects/app_settings/values/timeout/',
+        response = auth_client.get(
+            VALUE_URL_TPL.format(asset='test-asset', obj='app_settings', key='timeout'),
             {'environment': 'local'}
         )
         
         assert response.status_code == status.HTTP_200_OK
         
         # Check all required fields are present
-        required_fields = ['key', 'value', 'type', 'object', 'environment']
-        for field in required_fields:
-            assert field in response.data, f"Missing field: {field}"
+        required_fields = {'key', 'value', 'type', 'object', 'environment'}
+        missing = required_fields - response.data.keys()
+        assert not missing, f"Missing fields: {missing}"
         
         # Verify field values
-        assert response.data['key'] == 'timeout'
-        assert response.data['value'] == '30'
-        assert response.data['type'] == 'string'
-        assert response.data['object'] == 'app_settings'
-        assert response.data['environment'] == 'local'
+        assert response.data == {
+            'key': 'timeout',
+            'value': '30',
+            'type': 'string',
+            'object': 'app_settings',
+            'environment': 'local',
+        }
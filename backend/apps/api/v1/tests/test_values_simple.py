@@ -1,23 +1,18 @@
 import pytest
 from rest_framework import status
-from rest_framework.test import APIClient
 
 @pytest.mark.django_db
 class TestConfigValuesView:
     
-    def test_get_values_unauthenticated(self):
+    def test_get_values_unauthenticated(self, api_client):
         """Test that unauthenticated requests are rejected."""
-        client = APIClient()
-        response = client.get("/api/v1/assets/test-asset/values/")
+        response = api_client.get("/api/v1/assets/test-asset/values/")
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
-    def test_get_values_success(self, test_api_key, test_asset, test_config_values):
+    def test_get_values_success(self, auth_client, test_asset, test_config_values):
         """Test retrieving values with a valid API key."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         url = f"/api/v1/assets/{test_asset.slug}/values/"
-        response = client.get(url)
+        response = auth_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
@@ -29,39 +24,91 @@ class TestConfigValuesView:
         assert settings['theme'] == 'dark'
         assert settings['timeout'] == '30'
 
-    def test_get_values_scope_enforcement(self, production_api_key, test_asset, test_config_values, production_config_values):
+    def test_get_values_scope_enforcement(self, prod_client, test_asset, all_config_values):
         """
         Ensure production API key retrieves production values, 
         ignoring 'environment=local' query parameter.
         """
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=production_api_key.key_value)
-        
         # Request 'local' explicitly, but key is 'production' scoped
         url = f"/api/v1/assets/{test_asset.slug}/values/?environment=local"
-        response = client.get(url)
+        response = prod_client.get(url)
         
         # Should fail with 403 because we requested 'local' but allowed only 'production'
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
-    def test_get_values_asset_not_found(self, test_api_key):
+    def test_get_values_asset_not_found(self, auth_client):
         """Test 404 for non-existent asset."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
+        response = auth_client.get("/api/v1/assets/non-existent-asset/values/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_values_asset_deleted_after_lookup_cached(self, auth_client, test_asset, test_config_values):
+        """Test the cached asset lookup is dropped when the asset is deleted."""
+        url = f"/api/v1/assets/{test_asset.slug}/values/"
+        assert auth_client.get(url).status_code == status.HTTP_200_OK
+        
+        test_asset.delete()
         
-        response = client.get("/api/v1/assets/non-existent-asset/values/")
+        response = auth_client.get(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+@pytest.mark.django_db
+class TestConfigValuesUpdate:
+    
+    def test_post_creates_and_updates_values(self, auth_client, test_asset):
+        """Test a POST inserts new keys and overwrites existing ones."""
+        from apps.config_assets.models import ConfigValue
+        
+        url = f"/api/v1/assets/{test_asset.slug}/values/"
+        response = auth_client.post(url, {'HOST': {'value': 'a'}}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = auth_client.post(
+            url, {'HOST': {'value': 'b'}, 'PORT': {'value': 8080}}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'status': 'updated', 'count': 2}
+        
+        stored = dict(
+            ConfigValue.objects.filter(
+                config_object__asset=test_asset, environment='local'
+            ).values_list('key', 'value_string')
+        )
+        assert stored == {'HOST': 'b', 'PORT': '8080'}
+    
+    def test_post_stores_encrypted_bytes(self, auth_client, test_asset):
+        """Test encrypted values are stored as bytes with no plaintext."""
+        from apps.config_assets.models import ConfigValue
+        
+        url = f"/api/v1/assets/{test_asset.slug}/values/"
+        response = auth_client.post(
+            url, {'SECRET': {'value': 'c2VjcmV0', 'type': 'encrypted'}}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        
+        value = ConfigValue.objects.get(config_object__asset=test_asset, key='SECRET')
+        assert bytes(value.value_encrypted) == b'secret'
+        assert value.value_string is None
+    
+    def test_post_invalidates_cached_reads(self, auth_client, test_asset):
+        """Test cached list and detail responses are dropped by a POST."""
+        url = f"/api/v1/assets/{test_asset.slug}/values/"
+        detail_url = f"/api/v1/assets/{test_asset.slug}/objects/app/values/HOST/"
+        auth_client.post(url, {'HOST': {'value': 'a'}}, format='json')
+        assert auth_client.get(url).json() == {'app': {'HOST': 'a'}}
+        assert auth_client.get(detail_url).json()['value'] == 'a'
+        
+        auth_client.post(url, {'HOST': {'value': 'b'}}, format='json')
+        
+        assert auth_client.get(url).json() == {'app': {'HOST': 'b'}}
+        assert auth_client.get(detail_url).json()['value'] == 'b'
+
 @pytest.mark.django_db
 class TestConfigValueDetailView:
     
-    def test_get_detail_value_success(self, test_api_key, test_asset, test_config_values):
+    def test_get_detail_value_success(self, auth_client, test_asset, test_config_values):
         """Test getting a single configuration value."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         url = f"/api/v1/assets/{test_asset.slug}/objects/app_settings/values/theme/"
-        response = client.get(url)
+        response = auth_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
@@ -71,12 +118,9 @@ class TestConfigValueDetailView:
         assert data['object'] == 'app_settings'
         assert data['environment'] == 'local'
 
-    def test_get_detail_value_not_found(self, test_api_key, test_asset):
+    def test_get_detail_value_not_found(self, auth_client, test_asset):
         """Test getting a non-existent key."""
-        client = APIClient()
-        client.credentials(HTTP_X_API_KEY=test_api_key.key_value)
-        
         url = f"/api/v1/assets/{test_asset.slug}/objects/app_settings/values/non_existent_key/"
-        response = client.get(url)
+        response = auth_client.get(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
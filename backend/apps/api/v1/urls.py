@@ -3,7 +3,7 @@ URL configuration for Public API v1.
 Simplified endpoints - organization is derived from API key.
 """
 
-from django.urls import path
+from django.urls import include, path
 from apps.api.v1.views import health, me
 from apps.api.v1.views import values_simple, assets_simple
 
@@ -22,23 +22,27 @@ urlpatterns = [
         assets_simple.AssetListView.as_view(),
         name='asset-list'
     ),
-    path(
-        'assets/<str:asset>/',
-        assets_simple.AssetDetailView.as_view(),
-        name='asset-detail'
-    ),
     
-    # Config values (simplified - org from API key)
-    path(
-        'assets/<str:asset>/values/',
-        values_simple.ConfigValuesView.as_view(),
-        name='config-values'
-    ),
-    
-    # Granular config value (simplified - org from API key)
-    path(
-        'assets/<str:asset>/objects/<str:object_name>/values/<str:key>/',
-        values_simple.ConfigValueDetailView.as_view(),
-        name='config-value-detail'
-    ),
+    # Per-asset endpoints share one prefix match (simplified - org from API key)
+    path('assets/<str:asset>/', include([
+        path(
+            '',
+            assets_simple.AssetDetailView.as_view(),
+            name='asset-detail'
+        ),
+        
+        # Config values
+        path(
+            'values/',
+            values_simple.ConfigValuesView.as_view(),
+            name='config-values'
+        ),
+        
+        # Granular config value
+        path(
+            'objects/<str:object_name>/values/<str:key>/',
+            values_simple.ConfigValueDetailView.as_view(),
+            name='config-value-detail'
+        ),
+    ])),
 ]
@@ -5,8 +5,8 @@ Asset endpoints for Public API v1.
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
 from apps.api_keys.authentication import APIKeyAuthentication
+from apps.core.permissions import HasAPIKey
 from apps.authentication.models import Tenant
 from apps.config_assets.models import ConfigAsset, ConfigObject
 
@@ -21,7 +21,7 @@ class AssetListView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request, org):
         """
@@ -37,7 +37,7 @@ class AssetListView(APIView):
         """
         # Get tenant
         try:
-            tenant = Tenant.objects.get(slug=org)
+            tenant = Tenant.objects.only('id').get(slug=org)
         except Tenant.DoesNotExist:
             return Response(
                 {'error': f"Organization '{org}' not found"},
@@ -53,14 +53,16 @@ class AssetListView(APIView):
             )
         
         # Get assets
-        assets = ConfigAsset.objects.filter(tenant=tenant).order_by('name')
+        assets = ConfigAsset.objects.filter(tenant=tenant).values(
+            'id', 'slug', 'name', 'description'
+        ).order_by('name')
         
         assets_data = [
             {
-                'id': str(asset.id),
-                'slug': asset.slug,
-                'name': asset.name,
-                'description': asset.description or ''
+                'id': str(asset['id']),
+                'slug': asset['slug'],
+                'name': asset['name'],
+                'description': asset['description'] or ''
             }
             for asset in assets
         ]
@@ -78,7 +80,7 @@ class AssetDetailView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request, org, asset):
         """
@@ -95,7 +97,7 @@ class AssetDetailView(APIView):
         """
         # Get tenant
         try:
-            tenant = Tenant.objects.get(slug=org)
+            tenant = Tenant.objects.only('id').get(slug=org)
         except Tenant.DoesNotExist:
             return Response(
                 {'error': f"Organization '{org}' not found"},
@@ -112,7 +114,9 @@ class AssetDetailView(APIView):
         
         # Get asset
         try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
+            asset_obj = ConfigAsset.objects.only(
+                'id', 'slug', 'name', 'description'
+            ).get(tenant=tenant, slug=asset)
         except ConfigAsset.DoesNotExist:
             return Response(
                 {'error': f"Asset '{asset}' not found"},
@@ -120,7 +124,9 @@ class AssetDetailView(APIView):
             )
         
         # Get config objects
-        objects = ConfigObject.objects.filter(asset=asset_obj).order_by('name')
+        objects = ConfigObject.objects.filter(asset=asset_obj).values(
+            'id', 'name', 'object_type', 'description'
+        ).order_by('name')
         
         asset_data = {
             'id': str(asset_obj.id),
@@ -129,10 +135,10 @@ class AssetDetailView(APIView):
             'description': asset_obj.description or '',
             'objects': [
                 {
-                    'id': str(obj.id),
-                    'name': obj.name,
-                    'type': obj.object_type,
-                    'description': obj.description or ''
+                    'id': str(obj['id']),
+                    'name': obj['name'],
+                    'type': obj['object_type'],
+                    'description': obj['description'] or ''
                 }
                 for obj in objects
             ]
@@ -3,13 +3,48 @@ Simplified assets endpoints for Public API v1.
 Endpoints only require API key - organization is derived from the key.
 """
 
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models import Prefetch, TextField
+from django.db.models.functions import Cast
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
 from apps.api_keys.authentication import APIKeyAuthentication
+from apps.core.permissions import HasAPIKey
 from apps.config_assets.models import ConfigAsset, ConfigObject
 
+# Asset listings are invalidated by the config_assets signals; the TTL only
+# bounds staleness for writes that bypass them (bulk updates, raw SQL).
+ASSETS_CACHE_TTL = 60
+
+
+def _cache_entry(data):
+    """Wrap a response payload with its ETag for caching."""
+    digest = hashlib.md5(
+        json.dumps(data, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+    return {'data': data, 'etag': f'W/"{digest}"'}
+
+
+def _conditional_response(request, entry, response_class):
+    """
+    Answer a conditional GET from a cache entry.
+    
+    Returns 304 Not Modified if the client's If-None-Match already matches
+    the entry's ETag, otherwise the payload with the ETag attached.
+    """
+    not_modified = get_conditional_response(request, etag=entry['etag'])
+    if not_modified is not None:
+        return not_modified
+    
+    response = response_class(entry['data'])
+    response['ETag'] = entry['etag']
+    return response
+
 
 class AssetListView(APIView):
     """
@@ -21,35 +56,54 @@ class AssetListView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request):
         """
         List all assets for the organization.
         
+        The payload is plain JSON built from values(), so it is returned as a
+        JsonResponse rather than going through DRF content negotiation and
+        rendering.
+        
         Returns:
             200 OK: List of assets
+            304 Not Modified: If-None-Match matches the current ETag
         """
         # Get tenant from API key
         api_key = request.auth
         tenant = api_key.tenant
         
-        # Get all assets for this tenant
-        assets = ConfigAsset.objects.filter(tenant=tenant).order_by('name')
+        # Check cache first
+        cache_key = f"assets:{tenant.slug}"
+        cached_entry = cache.get(cache_key)
+        if cached_entry is not None:
+            return _conditional_response(request, cached_entry, JsonResponse)
+        
+        # Get all assets for this tenant, fetching only the columns the
+        # payload uses. Postgres formats the UUIDs.
+        assets = ConfigAsset.objects.filter(tenant=tenant).annotate(
+            id_text=Cast('id', output_field=TextField())
+        ).values(
+            'id_text', 'slug', 'name', 'description'
+        ).order_by('name')
         
         assets_data = {
             'assets': [
                 {
-                    'id': str(asset.id),
-                    'slug': asset.slug,
-                    'name': asset.name,
-                    'description': asset.description or '',
+                    'id': asset['id_text'],
+                    'slug': asset['slug'],
+                    'name': asset['name'],
+                    'description': asset['description'] or '',
                 }
                 for asset in assets
             ]
         }
         
-        return Response(assets_data)
+        entry = _cache_entry(assets_data)
+        cache.set(cache_key, entry, ASSETS_CACHE_TTL)
+        
+        return _conditional_response(request, entry, JsonResponse)
 
 
 class AssetDetailView(APIView):
@@ -62,7 +116,7 @@ class AssetDetailView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request, asset):
         """
@@ -73,24 +127,40 @@ class AssetDetailView(APIView):
             
         Returns:
             200 OK: Asset details
+            304 Not Modified: If-None-Match matches the current ETag
             404 Not Found: Asset not found
         """
         # Get tenant from API key
         api_key = request.auth
         tenant = api_key.tenant
         
-        # Get asset
-        try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
+        # Check cache first
+        cache_key = f"assets:{tenant.slug}:{asset}"
+        cached_entry = cache.get(cache_key)
+        if cached_entry is not None:
+            return _conditional_response(request, cached_entry, Response)
+        
+        # Get asset with its config objects in one extra query; a miss
+        # returns None rather than raising, and skips the prefetch
+        asset_obj = ConfigAsset.objects.filter(
+            tenant=tenant, slug=asset
+        ).only(
+            'id', 'slug', 'name', 'description'
+        ).prefetch_related(
+            Prefetch(
+                'config_objects',
+                queryset=ConfigObject.objects.only(
+                    'id', 'asset_id', 'name', 'object_type', 'description'
+                ).order_by('name'),
+                to_attr='prefetched_objects'
+            )
+        ).first()
+        if asset_obj is None:
             return Response(
                 {'error': f"Asset '{asset}' not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get config objects for this asset
-        objects = ConfigObject.objects.filter(asset=asset_obj).order_by('name')
-        
         asset_data = {
             'id': str(asset_obj.id),
             'slug': asset_obj.slug,
@@ -103,8 +173,11 @@ class AssetDetailView(APIView):
                     'type': obj.object_type,
                     'description': obj.description or '',
                 }
-                for obj in objects
+                for obj in asset_obj.prefetched_objects
             ]
         }
         
-        return Response(asset_data)
+        entry = _cache_entry(asset_data)
+        cache.set(cache_key, entry, ASSETS_CACHE_TTL)
+        
+        return _conditional_response(request, entry, Response)
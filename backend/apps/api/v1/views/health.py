@@ -5,10 +5,44 @@ Health check endpoint for Public API v1.
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import connection
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.utils import timezone
 
 
+# Liveness probes hit this endpoint every few seconds per pod; only one
+# request per window actually touches the database.
+DB_PROBE_CACHE_KEY = 'health:db:v1'
+DB_PROBE_TTL = 5
+
+# Upper bound on the probe query, so a struggling database fails the check
+# quickly instead of tying up the worker
+DB_PROBE_STATEMENT_TIMEOUT_MS = 500
+
+
+def _probe_database():
+    """Check the database connection, returning an error message or None."""
+    try:
+        # SET LOCAL only lasts until the end of this transaction
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SET LOCAL statement_timeout = {DB_PROBE_STATEMENT_TIMEOUT_MS}"
+            )
+            cursor.execute("SELECT 1")
+    except Exception as e:
+        return {'error': str(e)}
+    return {'error': None}
+
+
+def _database_status():
+    """Return the cached database probe result, probing on a miss."""
+    try:
+        return cache.get_or_set(DB_PROBE_CACHE_KEY, _probe_database, DB_PROBE_TTL)
+    except Exception:
+        # Cache unavailable; report on the database alone
+        return _probe_database()
+
+
 class HealthCheckView(APIView):
     """
     Health check endpoint.
@@ -38,12 +72,12 @@ class HealthCheckView(APIView):
         }
         
         # Check database connection
-        try:
-            connection.ensure_connection()
+        db_status = _database_status()
+        if db_status['error'] is None:
             health_status['database'] = 'connected'
-        except Exception as e:
+        else:
             health_status['database'] = 'disconnected'
-            health_status['database_error'] = str(e)
+            health_status['database_error'] = db_status['error']
             health_status['status'] = 'unhealthy'
             return Response(
                 health_status,
@@ -5,8 +5,8 @@ API Key metadata endpoint for Public API v1.
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
 from apps.api_keys.authentication import APIKeyAuthentication
+from apps.core.permissions import HasAPIKey
 
 
 class APIKeyMetadataView(APIView):
@@ -20,7 +20,7 @@ class APIKeyMetadataView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request):
         """
@@ -32,15 +32,9 @@ class APIKeyMetadataView(APIView):
         """
         api_key = request.auth
         
-        metadata = {
-            'organization': api_key.tenant.slug,
-            'environment': api_key.environment,
-            'scope': api_key.scope,
-            'label': api_key.label,
-        }
-        
-        # Add asset info if key is asset-scoped
-        if api_key.scope == 'asset' and api_key.asset:
-            metadata['asset'] = api_key.asset.slug
+        # Built on save and loaded with the key during authentication, so
+        # no joins or extra queries; rows written without save() fall back
+        # to building it here
+        metadata = api_key.metadata_json or api_key.build_metadata()
         
         return Response(metadata)
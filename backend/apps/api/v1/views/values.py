@@ -2,15 +2,76 @@
 Configuration values endpoints for Public API v1.
 """
 
+import json
+from itertools import groupby
+from operator import itemgetter
+
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
 from apps.api_keys.authentication import APIKeyAuthentication
+from apps.core.permissions import HasAPIKey
 from apps.authentication.models import Tenant
 from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
+from apps.config_assets.revisions import get_cached_values
 from django.core.cache import cache
 
+# Tenants and assets rarely change, so their rows are cached by slug. The
+# authentication and config_assets signals drop them on save or delete.
+CONTEXT_CACHE_TTL = 300
+
+
+def _resolve_context(request, org, asset, environment):
+    """
+    Resolve the asset for a values request, checking the API key's access.
+    
+    Returns:
+        (asset_obj, None) on success, or (None, error_response)
+    """
+    # Get tenant
+    try:
+        tenant = cache.get_or_set(
+            f"tenant:{org}",
+            lambda: Tenant.objects.only('id', 'slug').get(slug=org),
+            CONTEXT_CACHE_TTL
+        )
+    except Tenant.DoesNotExist:
+        return None, Response(
+            {'error': f"Organization '{org}' not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    # Verify API key has access to this tenant
+    api_key = request.auth
+    if api_key.tenant_id != tenant.id:
+        return None, Response(
+            {'error': "You don't have access to this organization"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    # Check environment scope
+    if api_key.environment and api_key.environment != environment:
+        return None, Response(
+            {'error': f"API Key is not authorized for environment '{environment}'"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    # Get asset
+    try:
+        asset_obj = cache.get_or_set(
+            f"asset:{org}:{asset}",
+            lambda: ConfigAsset.objects.only('id').get(tenant=tenant, slug=asset),
+            CONTEXT_CACHE_TTL
+        )
+    except ConfigAsset.DoesNotExist:
+        return None, Response(
+            {'error': f"Asset '{asset}' not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return asset_obj, None
+
 
 class ConfigValuesView(APIView):
     """
@@ -23,12 +84,15 @@ class ConfigValuesView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request, org, asset):
         """
         Get all config values for asset + environment.
         
+        Successful responses are JSON encoded once and the bytes cached,
+        so cache hits are returned without DRF rendering.
+        
         Args:
             org: Organization slug
             asset: Asset slug
@@ -43,69 +107,39 @@ class ConfigValuesView(APIView):
         """
         environment = request.query_params.get('environment', 'local')
         
-        # Check cache first
+        # Check cache first; entries from before the last write are stale
         cache_key = f"config:{org}:{asset}:{environment}"
-        cached_data = cache.get(cache_key)
+        revision, cached_data = get_cached_values(org, asset, environment, cache_key)
         if cached_data is not None:
-            return Response(cached_data)
-        
-        # Get tenant
-        try:
-            tenant = Tenant.objects.get(slug=org)
-        except Tenant.DoesNotExist:
-            return Response(
-                {'error': f"Organization '{org}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Verify API key has access to this tenant
-        api_key = request.auth
-        if api_key.tenant_id != tenant.id:
-            return Response(
-                {'error': "You don't have access to this organization"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Check environment scope
-        if api_key.environment and api_key.environment != environment:
-            return Response(
-                {'error': f"API Key is not authorized for environment '{environment}'"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Get asset
-        try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
-            return Response(
-                {'error': f"Asset '{asset}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Get all config objects and their values
-        objects = ConfigObject.objects.filter(asset=asset_obj)
-        values_data = {}
-        
-        for obj in objects:
-            values = ConfigValue.objects.filter(
-                config_object=obj,
-                environment=environment
-            )
-            
-            if values.exists():
-                obj_values = {}
-                for value in values:
-                    if value.value_type == 'json':
-                        obj_values[value.key] = value.value_json
-                    else:
-                        obj_values[value.key] = value.value_string
-                
-                values_data[obj.name] = obj_values
+            return HttpResponse(cached_data['body'], content_type='application/json')
+        
+        # Resolve and authorize the tenant and asset
+        asset_obj, error = _resolve_context(request, org, asset, environment)
+        if error is not None:
+            return error
+        
+        # Get every value for this environment, with its object's name, in
+        # one joined query
+        rows = ConfigValue.objects.filter(
+            config_object__asset=asset_obj,
+            environment=environment
+        ).order_by('config_object__name', 'key').values_list(
+            'config_object__name', 'key', 'value_type', 'value_json', 'value_string'
+        )
+        # Rows arrive ordered by object name, so each object is one group
+        values_data = {
+            object_name: {
+                key: value_json if value_type == 'json' else value_string
+                for _, key, value_type, value_json, value_string in object_rows
+            }
+            for object_name, object_rows in groupby(rows, key=itemgetter(0))
+        }
         
-        # Cache for 5 minutes
-        cache.set(cache_key, values_data, 300)
+        # Cache the encoded body for 5 minutes, so hits skip DRF rendering
+        body = json.dumps(values_data).encode()
+        cache.set(cache_key, {'rev': revision, 'body': body}, 300)
         
-        return Response(values_data)
+        return HttpResponse(body, content_type='application/json')
 
 
 class ConfigValueDetailView(APIView):
@@ -119,7 +153,7 @@ class ConfigValueDetailView(APIView):
     """
     
     authentication_classes = [APIKeyAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasAPIKey]
     
     def get(self, request, org, asset, object_name, key):
         """
@@ -141,48 +175,20 @@ class ConfigValueDetailView(APIView):
         """
         environment = request.query_params.get('environment', 'local')
         
-        # Check cache first
+        # Check cache first; entries from before the last write are stale
         cache_key = f"config:{org}:{asset}:{object_name}:{key}:{environment}"
-        cached_data = cache.get(cache_key)
+        revision, cached_data = get_cached_values(org, asset, environment, cache_key)
         if cached_data is not None:
-            return Response(cached_data)
+            return Response(cached_data['data'])
         
-        # Get tenant
-        try:
-            tenant = Tenant.objects.get(slug=org)
-        except Tenant.DoesNotExist:
-            return Response(
-                {'error': f"Organization '{org}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Verify API key has access to this tenant
-        api_key = request.auth
-        if api_key.tenant_id != tenant.id:
-            return Response(
-                {'error': "You don't have access to this organization"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Check environment scope
-        if api_key.environment and api_key.environment != environment:
-            return Response(
-                {'error': f"API Key is not authorized for environment '{environment}'"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Get asset
-        try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
-            return Response(
-                {'error': f"Asset '{asset}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # Resolve and authorize the tenant and asset
+        asset_obj, error = _resolve_context(request, org, asset, environment)
+        if error is not None:
+            return error
         
         # Get config object
         try:
-            config_obj = ConfigObject.objects.get(asset=asset_obj, name=object_name)
+            config_obj = ConfigObject.objects.only('id').get(asset=asset_obj, name=object_name)
         except ConfigObject.DoesNotExist:
             return Response(
                 {'error': f"Config object '{object_name}' not found"},
@@ -191,7 +197,9 @@ class ConfigValueDetailView(APIView):
         
         # Get specific value
         try:
-            config_value = ConfigValue.objects.get(
+            config_value = ConfigValue.objects.only(
+                'value_type', 'value_json', 'value_string'
+            ).get(
                 config_object=config_obj,
                 key=key,
                 environment=environment
@@ -221,7 +229,7 @@ class ConfigValueDetailView(APIView):
             }
         
         # Cache for 5 minutes
-        cache.set(cache_key, value_data, 300)
+        cache.set(cache_key, {'rev': revision, 'data': value_data}, 300)
         
         return Response(value_data)
 
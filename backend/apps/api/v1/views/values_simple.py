@@ -3,6 +3,13 @@ Simplified configuration values endpoints for Public API v1.
 Endpoints only require API key - organization is derived from the key.
 """
 
+import base64
+import json
+from itertools import groupby
+from operator import itemgetter
+
+from django.http import HttpResponse
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -10,10 +17,50 @@ from rest_framework import status
 from apps.core.permissions import HasAPIKey, TenantContextPermission
 from apps.api_keys.authentication import APIKeyAuthentication
 from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
+from apps.config_assets.revisions import get_cached_values, bump_values_revision
 from django.core.cache import cache
 
 from django.db import transaction
 
+# Assets rarely change, so their rows are cached by slug. The config_assets
+# signals drop them on save or delete.
+ASSET_CACHE_TTL = 300
+
+
+def _resolve_environment(request):
+    """
+    Resolve the environment for a request from its API key.
+    
+    A key scoped to an environment may only request that environment; an
+    unscoped key defaults to 'local'.
+    
+    Returns:
+        (environment, None) on success, or (None, error_response)
+    """
+    api_key = request.auth
+    requested_env = request.query_params.get('environment')
+    if api_key.environment:
+        if requested_env and requested_env != api_key.environment:
+            return None, Response(
+                {'error': f"API Key is not authorized for environment '{requested_env}'"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return api_key.environment, None
+    return requested_env or 'local', None
+
+
+def _get_asset(tenant, asset):
+    """Return the tenant's asset (id only) by slug, or None if it doesn't exist."""
+    try:
+        return cache.get_or_set(
+            f"asset:{tenant.slug}:{asset}",
+            lambda: ConfigAsset.objects.only('id').get(tenant=tenant, slug=asset),
+            ASSET_CACHE_TTL
+        )
+    except ConfigAsset.DoesNotExist:
+        return None
+
+
 class ConfigValuesView(APIView):
     """
     Get configuration values for an asset.
@@ -30,6 +77,9 @@ class ConfigValuesView(APIView):
         """
         Get all config values for asset + environment.
         
+        Successful responses are JSON encoded once and the bytes cached,
+        so cache hits are returned without DRF rendering.
+        
         Args:
             asset: Asset slug
             
@@ -42,84 +92,64 @@ class ConfigValuesView(APIView):
             404 Not Found: Asset not found
         """
         # Get tenant and environment from API key
-        api_key = request.auth
-        tenant = api_key.tenant
-        
-        # Environment check
-        requested_env = request.query_params.get('environment')
-        if api_key.environment:
-            if requested_env and requested_env != api_key.environment:
-                return Response(
-                    {'error': f"API Key is not authorized for environment '{requested_env}'"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            environment = api_key.environment
-        else:
-            environment = requested_env or 'local'
+        tenant = request.auth.tenant
+        environment, error = _resolve_environment(request)
+        if error is not None:
+            return error
         
-        # Check cache first
+        # Check cache first; entries from before the last write are stale
         cache_key = f"config:{tenant.slug}:{asset}:{environment}"
-        cached_data = cache.get(cache_key)
-        cached_data = cache.get(cache_key)
+        revision, cached_data = get_cached_values(tenant.slug, asset, environment, cache_key)
         if cached_data is not None:
              # Cache Hit
-             return Response(cached_data)
+             return HttpResponse(cached_data['body'], content_type='application/json')
         
         # Cache Miss
         # Get asset
-        try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
+        asset_obj = _get_asset(tenant, asset)
+        if asset_obj is None:
             return Response(
                 {'error': f"Asset '{asset}' not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all config objects and their values
-        objects = ConfigObject.objects.filter(asset=asset_obj)
-        values_data = {}
-        
-        for obj in objects:
-            values = ConfigValue.objects.filter(
-                config_object=obj,
-                environment=environment
-            )
-            
-            if values.exists():
-                obj_values = {}
-                for value in values:
-                    if value.value_type == 'json':
-                        obj_values[value.key] = value.value_json
-                    else:
-                        obj_values[value.key] = value.value_string
-                
-                values_data[obj.name] = obj_values
+        # Get every value for this environment, with its object's name, in
+        # one joined query
+        rows = ConfigValue.objects.filter(
+            config_object__asset=asset_obj,
+            environment=environment
+        ).order_by('config_object__name', 'key').values_list(
+            'config_object__name', 'key', 'value_type', 'value_json', 'value_string'
+        )
+        # Rows arrive ordered by object name, so each object is one group
+        values_data = {
+            object_name: {
+                key: value_json if value_type == 'json' else value_string
+                for _, key, value_type, value_json, value_string in object_rows
+            }
+            for object_name, object_rows in groupby(rows, key=itemgetter(0))
+        }
         
-        # Cache for 5 minutes
-        cache.set(cache_key, values_data, 300)
+        # Cache the encoded body for 5 minutes, so hits skip DRF rendering
+        body = json.dumps(values_data).encode()
+        cache.set(cache_key, {'rev': revision, 'body': body}, 300)
         
-        return Response(values_data)
+        return HttpResponse(body, content_type='application/json')
 
     def post(self, request, asset):
         """
         Update/Create config values for asset + environment.
         Expects JSON payload: { "KEY": { "value": "val", "type": "string|encrypted" }, ... }
         """
-        api_key = request.auth
-        tenant = api_key.tenant
+        tenant = request.auth.tenant
         
         # Environment check (POST requires explicit env query param or defaults to local)
-        requested_env = request.query_params.get('environment')
-        if api_key.environment:
-            if requested_env and requested_env != api_key.environment:
-                return Response({'error': 'Environment mismatch'}, status=403)
-            environment = api_key.environment
-        else:
-            environment = requested_env or 'local'
+        environment, error = _resolve_environment(request)
+        if error is not None:
+            return error
 
-        try:
-             asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
+        asset_obj = _get_asset(tenant, asset)
+        if asset_obj is None:
              return Response({'error': 'Asset not found'}, status=404)
 
         data = request.data
@@ -138,39 +168,46 @@ class ConfigValuesView(APIView):
                 defaults={'object_type': 'kv'}
             )
 
+            incoming = []
             for key, item in data.items():
                 val = item.get('value')
                 val_type = item.get('type', 'string')
                 
-                # Create/Update ConfigValue
-                cv, created = ConfigValue.objects.get_or_create(
+                cv = ConfigValue(
                     config_object=default_obj,
                     environment=environment,
                     key=key,
-                    defaults={'value_type': 'string'} # Default
+                    value_type='string'
                 )
                 
                 if val_type == 'encrypted':
                      # Value is base64 encoded string of encrypted bytes
-                     import base64
                      try:
                          # We store the raw encrypted bytes in `value_encrypted`
                          # The client sends base64, we decode to bytes.
-                         encrypted_bytes = base64.b64decode(val)
-                         cv.value_encrypted = encrypted_bytes
+                         # It's still a string conceptually, just encrypted storage
+                         cv.value_encrypted = base64.b64decode(val)
                          cv.value_string = None # Clear plaintext
-                         cv.value_type = 'string' # It's still a string conceptually, just encrypted storage
-                     except Exception as e:
-                         pass
+                     except Exception:
+                         # Leave undecodable values untouched
+                         continue
                 else:
                     cv.value_string = str(val)
                     cv.value_encrypted = None
                 
-                cv.save()
+                incoming.append(cv)
+            
+            # Insert new keys and overwrite existing ones in one statement.
+            # bulk_create skips post_save, so the caches are invalidated below.
+            ConfigValue.objects.bulk_create(
+                incoming,
+                update_conflicts=True,
+                unique_fields=['config_object', 'environment', 'key'],
+                update_fields=['value_string', 'value_encrypted', 'value_type', 'updated_at']
+            )
 
-        # Invalidate Cache
-        cache_key = f"config:{tenant.slug}:{asset}:{environment}"
-        cache.delete(cache_key)
+        # Invalidate Cache (list and every detail response)
+        bump_values_revision(tenant.slug, asset, environment)
 
         return Response({'status': 'updated', 'count': len(data)})
 
@@ -205,31 +242,20 @@ class ConfigValueDetailView(APIView):
             404 Not Found: Asset, object, or key not found
         """
         # Get tenant and environment from API key
-        api_key = request.auth
-        tenant = api_key.tenant
+        tenant = request.auth.tenant
+        environment, error = _resolve_environment(request)
+        if error is not None:
+            return error
         
-        # Environment check
-        requested_env = request.query_params.get('environment')
-        if api_key.environment:
-            if requested_env and requested_env != api_key.environment:
-                return Response(
-                    {'error': f"API Key is not authorized for environment '{requested_env}'"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            environment = api_key.environment
-        else:
-            environment = requested_env or 'local'
-        
-        # Check cache first
+        # Check cache first; entries from before the last write are stale
         cache_key = f"config:{tenant.slug}:{asset}:{object_name}:{key}:{environment}"
-        cached_data = cache.get(cache_key)
+        revision, cached_data = get_cached_values(tenant.slug, asset, environment, cache_key)
         if cached_data is not None:
-            return Response(cached_data)
+            return Response(cached_data['data'])
         
         # Get asset
-        try:
-            asset_obj = ConfigAsset.objects.get(tenant=tenant, slug=asset)
-        except ConfigAsset.DoesNotExist:
+        asset_obj = _get_asset(tenant, asset)
+        if asset_obj is None:
             return Response(
                 {'error': f"Asset '{asset}' not found"},
                 status=status.HTTP_404_NOT_FOUND
@@ -237,7 +263,7 @@ class ConfigValueDetailView(APIView):
         
         # Get config object
         try:
-            config_obj = ConfigObject.objects.get(asset=asset_obj, name=object_name)
+            config_obj = ConfigObject.objects.only('id').get(asset=asset_obj, name=object_name)
         except ConfigObject.DoesNotExist:
             return Response(
                 {'error': f"Config object '{object_name}' not found"},
@@ -246,7 +272,9 @@ class ConfigValueDetailView(APIView):
         
         # Get specific value
         try:
-            config_value = ConfigValue.objects.get(
+            config_value = ConfigValue.objects.only(
+                'value_type', 'value_json', 'value_string'
+            ).get(
                 config_object=config_obj,
                 key=key,
                 environment=environment
@@ -276,6 +304,6 @@ class ConfigValueDetailView(APIView):
             }
         
         # Cache for 5 minutes
-        cache.set(cache_key, value_data, 300)
+        cache.set(cache_key, {'rev': revision, 'data': value_data}, 300)
         
         return Response(value_data)
@@ -5,3 +5,6 @@ class ApiKeysConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.api_keys'
     label = 'api_keys'
+
+    def ready(self):
+        import apps.api_keys.signals
@@ -1,6 +1,34 @@
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework import authentication, exceptions
 from .models import APIKey
 
+# Verified keys are cached with their tenant, asset and creator. The
+# api_keys signals drop the entry when the key is saved (e.g. revoked) or
+# deleted; the TTL bounds staleness of the related rows.
+API_KEY_CACHE_TTL = 60
+
+
+# Last use is buffered in the cache and written to the database by the
+# flush_api_key_last_used task, instead of an UPDATE per request. Entries
+# must outlive the interval the task is scheduled at.
+LAST_USED_CACHE_TTL = 60 * 60
+
+
+def api_key_cache_key(key_hash):
+    """Cache key for a verified API key, addressed by its stored hash."""
+    return f"apikey:{key_hash}"
+
+
+def last_used_cache_key(api_key_id):
+    """Cache key for the buffered last use time of an API key."""
+    return f"apikey_lastused:{api_key_id}"
+
+
+def record_key_use(api_key):
+    """Buffer the time an API key was used."""
+    cache.set(last_used_cache_key(api_key.id), timezone.now(), LAST_USED_CACHE_TTL)
+
 
 class APIKeyAuthentication(authentication.BaseAuthentication):
     """
@@ -37,22 +65,38 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
         if len(key) < 16:
             raise exceptions.AuthenticationFailed('Invalid API Key format')
             
+        # The hash is a keyed HMAC of the raw key, so finding an entry under
+        # it means the key was already verified
+        key_hash = APIKey.hash_key(key)
+        cache_key = api_key_cache_key(key_hash)
+        api_key = cache.get(cache_key)
+        if api_key is not None:
+            record_key_use(api_key)
+            return (api_key.created_by, api_key)
+        
         prefix = key[:16]
         
         try:
-            api_key = APIKey.objects.get(key_prefix=prefix, revoked=False)
+            api_key = APIKey.objects.select_related(
+                'tenant', 'asset', 'created_by'
+            ).get(
+                key_prefix=prefix, revoked=False
+            )
         except APIKey.DoesNotExist:
             raise exceptions.AuthenticationFailed('Invalid API Key')
 
         if not api_key.verify_key(key):
             raise exceptions.AuthenticationFailed('Invalid API Key')
 
+        # Move keys issued under bcrypt onto the fast hash on first use
+        if api_key.has_legacy_hash:
+            api_key.key_hash = key_hash
+            api_key.save(update_fields=['key_hash'])
+
         if api_key.revoked:
             raise exceptions.AuthenticationFailed('API Key revoked')
 
-        # Update last used timestamp (async to avoid DB write on every read?)
-        # For MVP, sync is fine, or use a background task if high volume.
-        # api_key.last_used_at = timezone.now()
-        # api_key.save(update_fields=['last_used_at'])
+        cache.set(cache_key, api_key, API_KEY_CACHE_TTL)
+        record_key_use(api_key)
 
         return (api_key.created_by, api_key)
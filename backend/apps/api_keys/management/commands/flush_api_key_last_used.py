@@ -0,0 +1,29 @@
+"""
+Management command to write buffered API key last use times to the database.
+
+Meant to be run periodically (e.g. every minute from cron). With --enqueue
+the flush runs on a Dramatiq worker instead.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.api_keys.tasks import flush_api_key_last_used, flush_last_used
+
+
+class Command(BaseCommand):
+    help = 'Write buffered API key last use times to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Send the flush to a Dramatiq worker instead of running it here'
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            flush_api_key_last_used.send()
+            self.stdout.write('Enqueued API key last use flush')
+            return
+
+        updated = flush_last_used()
+        self.stdout.write(self.style.SUCCESS(f'Updated last use for {updated} API key(s)'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+def populate_metadata(apps, schema_editor):
+    APIKey = apps.get_model('api_keys', 'APIKey')
+
+    for api_key in APIKey.objects.select_related('tenant', 'asset'):
+        metadata = {
+            'organization': api_key.tenant.slug,
+            'environment': api_key.environment,
+            'scope': api_key.scope,
+            'label': api_key.label,
+        }
+        if api_key.scope == 'asset' and api_key.asset_id:
+            metadata['asset'] = api_key.asset.slug
+
+        api_key.metadata_json = metadata
+        api_key.save(update_fields=['metadata_json'])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_keys", "0004_apikey_environment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apikey",
+            name="metadata_json",
+            field=models.JSONField(
+                default=dict,
+                editable=False,
+                help_text="Denormalized /me/ response, rebuilt on save",
+            ),
+        ),
+        migrations.RunPython(populate_metadata, reverse_code=migrations.RunPython.noop),
+    ]
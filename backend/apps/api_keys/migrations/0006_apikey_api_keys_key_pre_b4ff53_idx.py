@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_keys', '0005_apikey_metadata_json'),
+        ('authentication', '0007_tenant_tier'),
+        ('config_assets', '0005_update_rls_policies'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apikey',
+            index=models.Index(fields=['key_prefix', 'revoked'], name='api_keys_key_pre_b4ff53_idx'),
+        ),
+    ]
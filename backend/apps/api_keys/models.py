@@ -1,5 +1,6 @@
 import uuid
 import hashlib
+import hmac
 import bcrypt
 from django.db import models
 from django.conf import settings
@@ -57,15 +58,43 @@ class APIKey(models.Model):
     last_used_at = models.DateTimeField(null=True, blank=True)
     revoked = models.BooleanField(default=False)
     revoked_at = models.DateTimeField(null=True, blank=True)
+    metadata_json = models.JSONField(
+        default=dict,
+        editable=False,
+        help_text='Denormalized /me/ response, rebuilt on save'
+    )
 
     class Meta:
         db_table = 'api_keys'
         ordering = ['-created_at']
+        indexes = [
+            # Per-request key lookup in APIKeyAuthentication
+            models.Index(fields=['key_prefix', 'revoked']),
+        ]
 
     def __str__(self):
         scope_str = f"/{self.asset.slug}" if self.asset else ""
         return f"{self.tenant.name}{scope_str}/{self.label} ({self.key_prefix}...)"
 
+    def save(self, *args, **kwargs):
+        self.metadata_json = self.build_metadata()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'metadata_json' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'metadata_json']
+        super().save(*args, **kwargs)
+
+    def build_metadata(self) -> dict:
+        """Build the public API /me/ response for this key"""
+        metadata = {
+            'organization': self.tenant.slug,
+            'environment': self.environment,
+            'scope': self.scope,
+            'label': self.label,
+        }
+        if self.scope == 'asset' and self.asset_id:
+            metadata['asset'] = self.asset.slug
+        return metadata
+
     @staticmethod
     def generate_org_hash(tenant_slug: str) -> str:
         """Generate a short hash from tenant slug for security"""
@@ -74,9 +103,23 @@ class APIKey(models.Model):
 
     @staticmethod
     def hash_key(key: str) -> str:
-        """Hash an API key using bcrypt"""
-        return bcrypt.hashpw(key.encode(), bcrypt.gensalt()).decode()
+        """
+        Hash an API key with HMAC-SHA256.
+        
+        Keys are 256-bit random tokens, so a keyed fast hash is enough;
+        bcrypt's work factor only added latency to every request.
+        """
+        return hmac.new(
+            settings.API_KEY_HASH_SECRET.encode(), key.encode(), hashlib.sha256
+        ).hexdigest()
+
+    @property
+    def has_legacy_hash(self) -> bool:
+        """Whether key_hash is a bcrypt hash from before HMAC hashing"""
+        return self.key_hash.startswith('$2')
 
     def verify_key(self, key: str) -> bool:
         """Verify a key against the stored hash"""
-        return bcrypt.checkpw(key.encode(), self.key_hash.encode())
+        if self.has_legacy_hash:
+            return bcrypt.checkpw(key.encode(), self.key_hash.encode())
+        return hmac.compare_digest(self.key_hash, self.hash_key(key))
@@ -0,0 +1,70 @@
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.core.cache import cache
+from apps.authentication.models import Tenant
+from apps.config_assets.models import ConfigAsset
+from .authentication import api_key_cache_key
+from .models import APIKey
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=APIKey)
+def invalidate_api_key_cache(sender, instance, **kwargs):
+    """
+    Drop the cached authentication entry when an APIKey changes.
+    
+    Cache keys invalidated:
+    1. apikey:{key_hash}
+    """
+    try:
+        cache.delete(api_key_cache_key(instance.key_hash))
+        
+    except Exception as e:
+        # Don't block save on cache error, but log it
+        logger.error(
+            f"Cache invalidation error for APIKey: {e}",
+            exc_info=True,
+            extra={
+                'api_key_id': str(instance.id),
+                'error': str(e)
+            }
+        )
+
+
+@receiver(post_save, sender=Tenant)
+def refresh_tenant_key_metadata(sender, instance, **kwargs):
+    """
+    Rebuild APIKey.metadata_json for the tenant's keys when its slug changes.
+    
+    Only keys whose stored organization no longer matches are saved, so
+    ordinary tenant saves cost a single query.
+    """
+    stale_keys = instance.api_keys.exclude(
+        metadata_json__organization=instance.slug
+    ).select_related('asset')
+    
+    for api_key in stale_keys:
+        api_key.tenant = instance
+        api_key.save(update_fields=['metadata_json'])
+        logger.debug(
+            "Refreshed API key metadata after tenant change",
+            extra={'api_key_id': str(api_key.id), 'tenant_slug': instance.slug}
+        )
+
+
+@receiver(post_save, sender=ConfigAsset)
+def refresh_asset_key_metadata(sender, instance, **kwargs):
+    """Rebuild APIKey.metadata_json for keys scoped to an asset when its slug changes."""
+    stale_keys = instance.api_keys.filter(scope='asset').exclude(
+        metadata_json__asset=instance.slug
+    ).select_related('tenant')
+    
+    for api_key in stale_keys:
+        api_key.asset = instance
+        api_key.save(update_fields=['metadata_json'])
+        logger.debug(
+            "Refreshed API key metadata after asset change",
+            extra={'api_key_id': str(api_key.id), 'asset_slug': instance.slug}
+        )
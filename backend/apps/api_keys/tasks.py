@@ -0,0 +1,59 @@
+import dramatiq
+from django.core.cache import cache
+from .authentication import last_used_cache_key
+from .models import APIKey
+
+# Keys whose buffered timestamps are fetched per cache round trip
+FLUSH_BATCH_SIZE = 500
+
+
+def flush_last_used():
+    """
+    Write buffered last use times to the database.
+    
+    Only keys whose buffered time is newer than the stored one are updated,
+    in one bulk UPDATE per batch. bulk_update skips save() and its signals,
+    so cached keys and their metadata are left alone.
+    
+    Returns:
+        Number of keys updated
+    """
+    updated = 0
+    api_keys = APIKey.objects.filter(revoked=False).only('id', 'last_used_at')
+    
+    batch = []
+    for api_key in api_keys.iterator(chunk_size=FLUSH_BATCH_SIZE):
+        batch.append(api_key)
+        if len(batch) == FLUSH_BATCH_SIZE:
+            updated += _flush_batch(batch)
+            batch = []
+    if batch:
+        updated += _flush_batch(batch)
+    
+    return updated
+
+
+def _flush_batch(api_keys):
+    buffered = cache.get_many([last_used_cache_key(k.id) for k in api_keys])
+    
+    changed = []
+    for api_key in api_keys:
+        last_used_at = buffered.get(last_used_cache_key(api_key.id))
+        if last_used_at is not None and (
+            api_key.last_used_at is None or last_used_at > api_key.last_used_at
+        ):
+            api_key.last_used_at = last_used_at
+            changed.append(api_key)
+    
+    APIKey.objects.bulk_update(changed, ['last_used_at'])
+    return len(changed)
+
+
+@dramatiq.actor
+def flush_api_key_last_used():
+    """
+    Flush buffered API key last use times using Dramatiq worker.
+    
+    Enqueued periodically by `manage.py flush_api_key_last_used --enqueue`.
+    """
+    flush_last_used()
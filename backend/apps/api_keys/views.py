@@ -1,6 +1,7 @@
 from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from .models import APIKey
 from .serializers import APIKeySerializer
@@ -18,19 +19,18 @@ class APIKeyViewSet(viewsets.ModelViewSet):
         return APIKey.objects.filter(
             tenant=tenant,
             revoked=False
-        ).select_related('asset', 'created_by')
+        ).select_related('tenant', 'asset', 'created_by')
 
     def perform_destroy(self, instance):
         """Soft delete (revoke) instead of actual delete
         Users can revoke their own keys, admins can revoke any key"""
         # Check if user is admin or owns the key
         if self.request.user.role != 'admin' and instance.created_by != self.request.user:
-            from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only revoke your own API keys.")
         
         instance.revoked = True
         instance.revoked_at = timezone.now()
-        instance.save()
+        instance.save(update_fields=['revoked', 'revoked_at'])
 
     @action(detail=True, methods=['post'])
     def revoke(self, request, pk=None):
@@ -40,10 +40,9 @@ class APIKeyViewSet(viewsets.ModelViewSet):
         
         # Check if user is admin or owns the key
         if request.user.role != 'admin' and api_key.created_by != request.user:
-            from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You can only revoke your own API keys.")
         
         api_key.revoked = True
         api_key.revoked_at = timezone.now()
-        api_key.save()
+        api_key.save(update_fields=['revoked', 'revoked_at'])
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,42 @@
+"""
+Hashing for the audit log Merkle chain.
+
+Each log's hash covers the previous log's hash and the log's own content.
+Hashes are raw 32-byte SHA256 digests. The scheme is versioned per row so
+logs written under an older scheme still verify.
+"""
+
+import hashlib
+import json
+import orjson
+
+GENESIS_HASH = bytes(32)
+
+# 1: SHA256 over f"{previous_hash hex}{action}{target}{json.dumps(details, sort_keys=True)}"
+HASH_VERSION_LEGACY = 1
+# 2: SHA256 over the previous digest, then action, target and the
+#    orjson-canonical details as bytes, separated by FIELD_SEPARATOR
+HASH_VERSION = 2
+
+# Unit separator between variable-length fields, so moving characters
+# between action and target can't produce the same hash input
+FIELD_SEPARATOR = b'\x1f'
+
+
+def chain_hash(previous_hash, action, target, details, version=HASH_VERSION):
+    """Return the digest of a log under the given hash version."""
+    if version == HASH_VERSION_LEGACY:
+        data = f"{previous_hash.hex()}{action}{target}{json.dumps(details, sort_keys=True)}"
+        return hashlib.sha256(data.encode('utf-8')).digest()
+    
+    # Build the input once and hash it in a single call, so OpenSSL (1.1.1+,
+    # which can use the CPU's SHA extensions) absorbs it in one pass
+    data = b''.join([
+        previous_hash,
+        action.encode(),
+        FIELD_SEPARATOR,
+        target.encode(),
+        FIELD_SEPARATOR,
+        orjson.dumps(details, option=orjson.OPT_SORT_KEYS),
+    ])
+    return hashlib.sha256(data).digest()
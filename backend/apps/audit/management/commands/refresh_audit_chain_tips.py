@@ -0,0 +1,33 @@
+"""
+Management command to reload the cached audit chain tips from the database.
+
+Run on deploy, or after the cache has been flushed or restored, so writers
+never chain onto a stale tip.
+"""
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.audit.models import CHAIN_TIP_TTL, ActivityLog, chain_tip_cache_key
+from apps.authentication.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Reload the cached audit chain tip for every tenant'
+
+    def handle(self, *args, **options):
+        tenant_ids = Tenant.objects.values_list('id', flat=True)
+
+        count = 0
+        for tenant_id in tenant_ids.iterator():
+            # Hold the chain lock so no writer moves the tip while it is read
+            with transaction.atomic():
+                ActivityLog.lock_tenant_chain(tenant_id)
+                cache.set(
+                    chain_tip_cache_key(tenant_id),
+                    ActivityLog.get_chain_tip(tenant_id),
+                    CHAIN_TIP_TTL
+                )
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Refreshed audit chain tips for {count} tenant(s)'))
@@ -0,0 +1,39 @@
+"""
+Management command to refresh the audit Merkle tree and root for every tenant.
+
+Meant to be run periodically (e.g. hourly from cron); logs written since the
+last run have no inclusion proof until then. With --enqueue each tenant is
+refreshed on a Dramatiq worker instead.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.audit.merkle import refresh_merkle_root
+from apps.audit.tasks import refresh_tenant_merkle_root
+from apps.authentication.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Refresh the audit Merkle root for every tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Send each refresh to a Dramatiq worker instead of running it here'
+        )
+
+    def handle(self, *args, **options):
+        tenant_ids = Tenant.objects.values_list('id', flat=True)
+
+        count = 0
+        for tenant_id in tenant_ids.iterator():
+            if options['enqueue']:
+                refresh_tenant_merkle_root.send(str(tenant_id))
+            else:
+                refresh_merkle_root(tenant_id)
+            count += 1
+
+        if options['enqueue']:
+            self.stdout.write(f'Enqueued audit Merkle root refreshes for {count} tenant(s)')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Refreshed audit Merkle roots for {count} tenant(s)'))
@@ -0,0 +1,254 @@
+"""
+Merkle tree over each tenant's audit log hashes.
+
+The hash chain proves order but checking one row means re-hashing every row
+before it. A binary Merkle tree over the chain hashes lets a single row be
+checked against the tenant's stored root with log2(N) hashes.
+
+Every node is stored (AuditMerkleNode), so a proof reads only the siblings
+on its path instead of rebuilding the tree.
+
+Leaves and inner nodes are hashed with distinct prefixes (as in RFC 6962),
+so an inner node can never be passed off as a log. A level with an odd
+number of nodes carries its last node up unchanged.
+"""
+
+from hashlib import sha256
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .hashing import GENESIS_HASH
+from .models import ActivityLog, AuditMerkleNode, AuditMerkleRoot
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+# Rows fetched or written per round trip while reading a tenant's leaves
+# and storing its nodes
+LEAF_CHUNK_SIZE = 2000
+
+# First key of the advisory lock on a tenant's stored tree; the second key
+# is derived from the tenant id
+TREE_LOCK_NAMESPACE = 0x6d6b6c  # 'mkl'
+
+
+def merkle_leaf(log_hash):
+    return sha256(LEAF_PREFIX + log_hash).digest()
+
+
+def merkle_node(left, right):
+    return sha256(NODE_PREFIX + left + right).digest()
+
+
+def _parent_level(nodes):
+    parents = [merkle_node(nodes[i], nodes[i + 1]) for i in range(0, len(nodes) - 1, 2)]
+    if len(nodes) % 2:
+        parents.append(nodes[-1])
+    return parents
+
+
+def merkle_root(log_hashes):
+    """
+    Compute the root of the tree over a sequence of log hashes.
+
+    Returns:
+        (root_hash, height), or (GENESIS_HASH, 0) for no logs
+    """
+    nodes = [merkle_leaf(log_hash) for log_hash in log_hashes]
+    if not nodes:
+        return GENESIS_HASH, 0
+
+    height = 0
+    while len(nodes) > 1:
+        nodes = _parent_level(nodes)
+        height += 1
+    return nodes[0], height
+
+
+def merkle_proof(log_hashes, index):
+    """
+    Build the inclusion proof for the log at `index`.
+
+    Returns:
+        List of (side, sibling_hash) pairs from the leaf up, where side is
+        'left' or 'right' of the path
+    """
+    nodes = [merkle_leaf(log_hash) for log_hash in log_hashes]
+    proof = []
+    while len(nodes) > 1:
+        sibling = index ^ 1
+        if sibling < len(nodes):
+            proof.append(('left' if sibling < index else 'right', nodes[sibling]))
+        nodes = _parent_level(nodes)
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(log_hash, proof, root_hash):
+    """Check a log hash against a root using its inclusion proof."""
+    node = merkle_leaf(log_hash)
+    for side, sibling in proof:
+        node = merkle_node(sibling, node) if side == 'left' else merkle_node(node, sibling)
+    return node == root_hash
+
+
+def lock_tenant_tree(tenant_id, shared=False):
+    """
+    Take a transaction-scoped advisory lock on a tenant's stored tree.
+
+    Refreshes take it exclusively. Proofs share it, so they never read
+    nodes from a refresh that hasn't committed with its root.
+    """
+    lock = 'pg_advisory_xact_lock_shared' if shared else 'pg_advisory_xact_lock'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {lock}(%s, %s)",
+            [TREE_LOCK_NAMESPACE, tenant_id.int & 0x7fffffff]
+        )
+
+
+def _tenant_log_hashes(tenant_id, after_id=None):
+    """Stream a tenant's log ids and hashes in chain order."""
+    rows = ActivityLog.objects.filter(tenant_id=tenant_id)
+    if after_id is not None:
+        rows = rows.filter(id__gt=after_id)
+    rows = rows.order_by('id').values_list('id', 'hash')
+
+    # The driver returns bytea as a memoryview
+    for log_id, log_hash in rows.iterator(chunk_size=LEAF_CHUNK_SIZE):
+        yield log_id, bytes(log_hash)
+
+
+def _stored_tree_matches(merkle_root_obj):
+    """Whether the stored nodes end in the stored root."""
+    return AuditMerkleNode.objects.filter(
+        tenant_id=merkle_root_obj.tenant_id,
+        level=merkle_root_obj.height,
+        position=0,
+        hash=merkle_root_obj.root_hash,
+    ).exists()
+
+
+def refresh_merkle_root(tenant_id):
+    """
+    Extend a tenant's stored Merkle tree over every log committed since the
+    last refresh, and store its new root.
+
+    Appending leaves only changes the right edge of each level, so only
+    those nodes are recomputed and written, each from the new leaves plus
+    at most one stored node per level.
+
+    Returns:
+        The tenant's AuditMerkleRoot, or None if it has no logs yet
+    """
+    with transaction.atomic():
+        lock_tenant_tree(tenant_id)
+        merkle_root_obj = AuditMerkleRoot.objects.filter(tenant_id=tenant_id).first()
+
+        first, last_id = 0, None
+        if merkle_root_obj is not None:
+            if _stored_tree_matches(merkle_root_obj):
+                first, last_id = merkle_root_obj.leaf_count, merkle_root_obj.last_id
+            else:
+                # Roots from before nodes were stored; rebuild from the start
+                AuditMerkleNode.objects.filter(tenant_id=tenant_id).delete()
+
+        # Writers insert while holding the chain lock, so every row visible
+        # here has a lower id than any row still being written
+        nodes = []
+        rows = []
+        for log_id, log_hash in _tenant_log_hashes(tenant_id, last_id):
+            leaf = merkle_leaf(log_hash)
+            rows.append(AuditMerkleNode(
+                tenant_id=tenant_id, level=0, position=first + len(nodes), hash=leaf, log_id=log_id
+            ))
+            nodes.append(leaf)
+            last_id = log_id
+
+        if not nodes:
+            return merkle_root_obj
+
+        leaf_count = count = first + len(nodes)
+        level = 0
+        while count > 1:
+            # A changed node at an odd position pairs with the stored node
+            # to its left
+            if first % 2:
+                left = AuditMerkleNode.objects.filter(
+                    tenant_id=tenant_id, level=level, position=first - 1
+                ).values_list('hash', flat=True).get()
+                nodes.insert(0, bytes(left))
+                first -= 1
+            nodes = _parent_level(nodes)
+            first //= 2
+            count = (count + 1) // 2
+            level += 1
+            rows.extend(
+                AuditMerkleNode(tenant_id=tenant_id, level=level, position=first + i, hash=node)
+                for i, node in enumerate(nodes)
+            )
+
+        AuditMerkleNode.objects.bulk_create(
+            rows,
+            batch_size=LEAF_CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=['tenant', 'level', 'position'],
+            update_fields=['hash'],
+        )
+        merkle_root_obj, _ = AuditMerkleRoot.objects.update_or_create(
+            tenant_id=tenant_id,
+            defaults={
+                'root_hash': nodes[0],
+                'height': level,
+                'leaf_count': leaf_count,
+                'last_id': last_id,
+            }
+        )
+        return merkle_root_obj
+
+
+def build_inclusion_proof(log):
+    """
+    Build the inclusion proof for a log against its tenant's stored root,
+    reading only the sibling nodes on its path.
+
+    Returns:
+        (merkle_root, leaf_index, proof), or None if the log is newer than
+        the stored root
+    """
+    with transaction.atomic():
+        lock_tenant_tree(log.tenant_id, shared=True)
+        merkle_root_obj = AuditMerkleRoot.objects.filter(tenant_id=log.tenant_id).first()
+        if merkle_root_obj is None or log.id > merkle_root_obj.last_id:
+            return None
+
+        leaf_index = AuditMerkleNode.objects.filter(
+            tenant_id=log.tenant_id, level=0, log_id=log.id
+        ).values_list('position', flat=True).first()
+        if leaf_index is None:
+            return None
+
+        # The sibling of the path's node at each level, if it has one
+        path = []
+        index, count, level = leaf_index, merkle_root_obj.leaf_count, 0
+        while count > 1:
+            sibling = index ^ 1
+            if sibling < count:
+                path.append((level, sibling, 'left' if sibling < index else 'right'))
+            index //= 2
+            count = (count + 1) // 2
+            level += 1
+
+        siblings = Q(pk__in=[])
+        for level, position, _ in path:
+            siblings |= Q(level=level, position=position)
+        hashes = {
+            (level, position): bytes(node_hash)
+            for level, position, node_hash in AuditMerkleNode.objects.filter(
+                siblings, tenant_id=log.tenant_id
+            ).values_list('level', 'position', 'hash')
+        }
+
+    proof = [(side, hashes[(level, position)]) for level, position, side in path]
+    return merkle_root_obj, leaf_index, proof
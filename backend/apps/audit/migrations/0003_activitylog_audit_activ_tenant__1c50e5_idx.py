@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_activitylog_hash_activitylog_previous_hash_and_more'),
+        ('authentication', '0007_tenant_tier'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['tenant', '-id'], name='audit_activ_tenant__1c50e5_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_activitylog_audit_activ_tenant__1c50e5_idx'),
+    ]
+
+    operations = [
+        # Existing logs were hashed under the legacy scheme
+        migrations.AddField(
+            model_name='activitylog',
+            name='hash_version',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='hash_version',
+            field=models.PositiveSmallIntegerField(default=2, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:52
+
+from django.db import migrations, models
+
+
+TABLE = 'audit_activitylog'
+
+
+def drop_hash_like_index(apps, schema_editor):
+    # The unique varchar column has a varchar_pattern_ops index, which
+    # can't be carried over to bytea
+    index_name = schema_editor._create_index_name(TABLE, ['hash'], suffix='_like')
+    schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index_name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_activitylog_hash_version'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='activitylog',
+                    name='hash',
+                    field=models.BinaryField(max_length=32, null=True, unique=True),
+                ),
+                migrations.AlterField(
+                    model_name='activitylog',
+                    name='previous_hash',
+                    field=models.BinaryField(max_length=32, null=True),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_hash_like_index, migrations.RunPython.noop),
+                # Convert the stored hex digests to raw bytes
+                migrations.RunSQL(
+                    sql=[
+                        f'ALTER TABLE {TABLE} ALTER COLUMN hash TYPE bytea USING decode(hash, \'hex\')',
+                        f'ALTER TABLE {TABLE} ALTER COLUMN previous_hash TYPE bytea USING decode(previous_hash, \'hex\')',
+                    ],
+                    reverse_sql=[
+                        f'ALTER TABLE {TABLE} ALTER COLUMN hash TYPE varchar(64) USING encode(hash, \'hex\')',
+                        f'ALTER TABLE {TABLE} ALTER COLUMN previous_hash TYPE varchar(64) USING encode(previous_hash, \'hex\')',
+                    ],
+                ),
+            ],
+        ),
+    ]
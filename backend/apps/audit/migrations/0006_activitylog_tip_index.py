@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0005_activitylog_binary_hashes'),
+        ('authentication', '0007_tenant_tier'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='audit_activ_hash_9ac4a5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='audit_activ_previou_aaa4b4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='audit_activ_tenant__1c50e5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['tenant', '-id'], include=('hash',), name='audit_tenant_tip_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0006_activitylog_tip_index'),
+        ('authentication', '0007_tenant_tier'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['tenant', '-created_at', '-id'], name='audit_tenant_created_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0007_activitylog_created_index'),
+        ('authentication', '0007_tenant_tier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditMerkleRoot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('root_hash', models.BinaryField(max_length=32)),
+                ('height', models.PositiveSmallIntegerField()),
+                ('leaf_count', models.PositiveIntegerField()),
+                ('last_id', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='audit_merkle_root', to='authentication.tenant')),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0008_auditmerkleroot'),
+    ]
+
+    operations = [
+        # Logs are insert-only (WORM), so heap pages are packed full and
+        # autovacuum is triggered by inserts well before the 20% default. That
+        # keeps the visibility map current, so the chain tip and Merkle leaf
+        # reads stay index-only scans on audit_tenant_tip_idx.
+        migrations.RunSQL(
+            "ALTER TABLE audit_activitylog SET ("
+            "fillfactor = 100, "
+            "autovacuum_vacuum_insert_scale_factor = 0.01, "
+            "autovacuum_vacuum_scale_factor = 0.01)",
+            reverse_sql="ALTER TABLE audit_activitylog RESET ("
+            "fillfactor, "
+            "autovacuum_vacuum_insert_scale_factor, "
+            "autovacuum_vacuum_scale_factor)",
+        ),
+    ]
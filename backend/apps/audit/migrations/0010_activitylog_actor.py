@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0009_activitylog_storage_parameters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='actor_email',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='actor_name',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        # Copy the actor onto existing logs whose user still exists
+        migrations.RunSQL(
+            sql="""
+                UPDATE audit_activitylog AS log
+                SET actor_email = u.email,
+                    actor_name = LEFT(TRIM(CONCAT(u.first_name, ' ', u.last_name)), 255)
+                FROM users AS u
+                WHERE log.user_id = u.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:40
+
+from django.db import migrations, models
+
+
+TABLE = 'audit_activitylog'
+PARTITIONS = 16
+
+# Per partition, matching 0009 (storage parameters can't be set on a
+# partitioned table itself)
+PARTITION_STORAGE = (
+    'fillfactor = 100, '
+    'autovacuum_vacuum_insert_scale_factor = 0.01, '
+    'autovacuum_vacuum_scale_factor = 0.01'
+)
+
+
+def rebuild_table(apps, schema_editor, partitioned):
+    """
+    Copy the log table into a fresh one, hash partitioned by tenant or
+    plain, then recreate its keys, foreign keys and indexes under the names
+    Django gives them.
+
+    Postgres requires unique constraints on a partitioned table to include
+    the partition key, so its primary key is (tenant_id, id). Ids still come
+    from the one identity sequence.
+    """
+    ActivityLog = apps.get_model('audit', 'ActivityLog')
+    quote = schema_editor.quote_name
+    old_table = f'{TABLE}_old'
+
+    schema_editor.execute(f'ALTER TABLE {quote(TABLE)} RENAME TO {quote(old_table)}')
+    schema_editor.execute(
+        f'CREATE TABLE {quote(TABLE)} '
+        f'(LIKE {quote(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY)'
+        + (' PARTITION BY HASH (tenant_id)' if partitioned else '')
+    )
+    if partitioned:
+        for remainder in range(PARTITIONS):
+            schema_editor.execute(
+                f'CREATE TABLE {quote(f"{TABLE}_p{remainder}")} PARTITION OF {quote(TABLE)} '
+                f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder}) '
+                f'WITH ({PARTITION_STORAGE})'
+            )
+    else:
+        schema_editor.execute(f'ALTER TABLE {quote(TABLE)} SET ({PARTITION_STORAGE})')
+
+    schema_editor.execute(f'INSERT INTO {quote(TABLE)} SELECT * FROM {quote(old_table)} ORDER BY id')
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), MAX(id)) "
+        f'FROM {quote(TABLE)} HAVING MAX(id) IS NOT NULL'
+    )
+    schema_editor.execute(f'DROP TABLE {quote(old_table)}')
+
+    # Keys and indexes are built after the copy, and take the old names now
+    # the old table is gone
+    pk_columns = 'tenant_id, id' if partitioned else 'id'
+    schema_editor.execute(
+        f'ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(f"{TABLE}_pkey")} PRIMARY KEY ({pk_columns})'
+    )
+    for field in ActivityLog._meta.local_fields:
+        if field.remote_field:
+            schema_editor.execute(
+                schema_editor._create_fk_sql(ActivityLog, field, '_fk_%(to_table)s_%(to_column)s')
+            )
+        if field.db_index and not field.unique:
+            schema_editor.execute(schema_editor._create_index_sql(ActivityLog, fields=[field]))
+    for index in ActivityLog._meta.indexes:
+        schema_editor.add_index(ActivityLog, index)
+    for constraint in ActivityLog._meta.constraints:
+        schema_editor.add_constraint(ActivityLog, constraint)
+
+
+def partition_table(apps, schema_editor):
+    rebuild_table(apps, schema_editor, partitioned=True)
+
+
+def unpartition_table(apps, schema_editor):
+    rebuild_table(apps, schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0010_activitylog_actor'),
+    ]
+
+    operations = [
+        # Hashes only need to be unique within a tenant's chain, which a
+        # partitioned table can enforce
+        migrations.AlterField(
+            model_name='activitylog',
+            name='hash',
+            field=models.BinaryField(editable=False, max_length=32, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='activitylog',
+            constraint=models.UniqueConstraint(fields=('tenant', 'hash'), name='audit_tenant_hash_uniq'),
+        ),
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
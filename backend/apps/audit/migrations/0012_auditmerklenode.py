@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0011_partition_activitylog'),
+        ('authentication', '0008_tenantinvitation_tenant_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditMerkleNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveSmallIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('hash', models.BinaryField(max_length=32)),
+                ('log_id', models.BigIntegerField(null=True)),
+                ('tenant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='audit_merkle_nodes', to='authentication.tenant')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('level', 0)), fields=['tenant', 'log_id'], name='audit_merkle_leaf_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'level', 'position'), name='audit_merkle_node_uniq')],
+            },
+        ),
+    ]
@@ -1,9 +1,72 @@
-from django.db import models
+import logging
+from django.core.cache import cache
+from django.db import connection, models, transaction
 from django.conf import settings
 from apps.authentication.models import Tenant
+from .hashing import GENESIS_HASH, HASH_VERSION, chain_hash
+
+# First key of the advisory lock serializing writers to one tenant's chain;
+# the second key is derived from the tenant id
+CHAIN_LOCK_NAMESPACE = 0x617564  # 'aud'
+
+# The hash at the tip of each tenant's chain is cached so writers don't
+# have to read the tail row. Only ever written while holding the chain lock.
+CHAIN_TIP_TTL = 60 * 60
+
+
+logger = logging.getLogger(__name__)
+
+
+def chain_tip_cache_key(tenant_id):
+    return f"audit:tip-digest:{tenant_id}"
+
+
+class ActivityLogManager(models.Manager):
+    def bulk_append(self, tenant, rows, batch_size=500):
+        """
+        Append many logs to a tenant's chain at once.
+        
+        Takes the chain lock and reads the tip once, hashes every row in
+        order, then inserts them with bulk_create instead of one INSERT per
+        log. `rows` is an iterable of (action, target, details, user).
+        
+        Returns:
+            The created logs, in chain order
+        """
+        outermost = not connection.in_atomic_block
+        try:
+            with transaction.atomic():
+                ActivityLog.lock_tenant_chain(tenant.id)
+                previous_hash = ActivityLog.current_chain_tip(tenant.id)
+                
+                logs = []
+                for action, target, details, user in rows:
+                    log_hash = chain_hash(previous_hash, action, target, details)
+                    log = self.model(
+                        tenant=tenant,
+                        user=user,
+                        action=action,
+                        target=target,
+                        details=details,
+                        previous_hash=previous_hash,
+                        hash=log_hash,
+                        hash_version=HASH_VERSION,
+                    )
+                    log.fill_actor()
+                    logs.append(log)
+                    previous_hash = log_hash
+                
+                self.bulk_create(logs, batch_size=batch_size)
+                ActivityLog.remember_chain_tip(tenant.id, previous_hash, outermost)
+        except Exception:
+            ActivityLog.forget_chain_tip(tenant.id)
+            raise
+        return logs
 
 
 class ActivityLog(models.Model):
+    # In Postgres the table is hash partitioned by tenant (migration 0011), so
+    # every query should filter on tenant to be pruned to one partition
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='activities')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='activities')
     action = models.CharField(max_length=255)
@@ -12,45 +75,177 @@ class ActivityLog(models.Model):
     
     # Merkle Chain Fields
     # Initially null to allow migration of existing rows, or we flush them.
-    hash = models.CharField(max_length=64, unique=True, editable=False, null=True) 
-    previous_hash = models.CharField(max_length=64, editable=False, null=True) # Null for genesis block
+    # Raw SHA256 digests
+    hash = models.BinaryField(max_length=32, editable=False, null=True)
+    previous_hash = models.BinaryField(max_length=32, editable=False, null=True) # All zeros for genesis block
+    hash_version = models.PositiveSmallIntegerField(default=HASH_VERSION, editable=False)
+    
+    # Copied from the user when the log is written, so logs keep who acted
+    # after the user is deleted and listing them needs no join
+    actor_email = models.CharField(max_length=254, blank=True, editable=False)
+    actor_name = models.CharField(max_length=255, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ActivityLogManager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
-             models.Index(fields=['hash']),
-             models.Index(fields=['previous_hash']),
+             # Chain tail lookup, answered from the index alone
+             models.Index(fields=['tenant', '-id'], include=['hash'], name='audit_tenant_tip_idx'),
+             # Log listing, paged by (created_at, id)
+             models.Index(fields=['tenant', '-created_at', '-id'], name='audit_tenant_created_idx'),
+        ]
+        constraints = [
+             models.UniqueConstraint(fields=['tenant', 'hash'], name='audit_tenant_hash_uniq'),
         ]
 
     def __str__(self):
-        return f"{self.user} - {self.action} - {self.hash[:8]}"
+        return f"{self.user} - {self.action} - {self.hash.hex()[:8]}"
 
     def save(self, *args, **kwargs):
         if self.pk:
             # Prevent updates to existing logs (WORM)
             raise ValueError("ActivityLog is immutable and cannot be modified.")
         
-        # Calculate Hash
-        self.calculate_hash()
-        super().save(*args, **kwargs)
+        # Calculate Hash and insert while holding the tenant's chain lock, so
+        # concurrent writers can't both chain onto the same tail. For very
+        # high write volumes, a single-writer queue per tenant is the
+        # alternative to locking.
+        #
+        # The cached tip is only kept when this save commits on its own. Inside
+        # an outer transaction the row may still be rolled back after the lock
+        # is released, so the tip is dropped and the next writer reads the
+        # tail from the database.
+        self.fill_actor()
+        
+        outermost = not connection.in_atomic_block
+        try:
+            with transaction.atomic():
+                ActivityLog.lock_tenant_chain(self.tenant_id)
+                self.calculate_hash()
+                super().save(*args, **kwargs)
+                ActivityLog.remember_chain_tip(self.tenant_id, self.hash, outermost)
+        except Exception:
+            ActivityLog.forget_chain_tip(self.tenant_id)
+            raise
 
-    def calculate_hash(self):
-        import hashlib
-        import json
+    def fill_actor(self):
+        """Copy the acting user's email and name, unless already given."""
+        if self.user_id is None or self.actor_email:
+            return
+        self.actor_email = self.user.email
+        self.actor_name = self.user.get_full_name()[:255]
+
+    @staticmethod
+    def lock_tenant_chain(tenant_id):
+        """Take a transaction-scoped advisory lock on a tenant's chain."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [CHAIN_LOCK_NAMESPACE, tenant_id.int & 0x7fffffff]
+            )
+
+    @staticmethod
+    def get_chain_tip(tenant_id):
+        """
+        Read the hash at the tip of a tenant's chain from the database.
         
-        # Find previous log for this tenant to chain
-        # Note: concurrency race condition possible here. 
-        # For strict chain, we need locking or single-writer queue (like Dramatiq/Celery default behavior if strictly ordered).
-        # For MVP/PoC, we fetch latest.
-        last_log = ActivityLog.objects.filter(tenant=self.tenant).order_by('-created_at').first()
+        Ids are monotonic, so the newest row is found without a created_at
+        tiebreak. Returns the genesis hash for an empty chain.
+        """
+        last_hash = ActivityLog.objects.filter(
+            tenant_id=tenant_id
+        ).order_by('-id').values_list('hash', flat=True).first()
         
-        if last_log:
-            self.previous_hash = last_log.hash
-        else:
-            self.previous_hash = '0' * 64 # Genesis hash
+        if last_hash is not None:
+            # The driver returns bytea as a memoryview
+            return bytes(last_hash)
+        return GENESIS_HASH
+
+    # The tip cache only saves reading the tail row, which is always correct
+    # under the chain lock, so cache errors never fail a write. A failed
+    # read is a miss, and a failed write or delete drops the cached tip.
 
-        # Data to hash
-        data = f"{self.previous_hash}{self.action}{self.target}{json.dumps(self.details, sort_keys=True)}"
-        self.hash = hashlib.sha256(data.encode('utf-8')).hexdigest()
+    @staticmethod
+    def current_chain_tip(tenant_id):
+        """The hash to chain onto: the cached tip, else the tail row's."""
+        try:
+            tip = cache.get(chain_tip_cache_key(tenant_id))
+        except Exception:
+            logger.warning("Audit chain tip cache read failed", exc_info=True)
+            tip = None
+        if tip is None:
+            tip = ActivityLog.get_chain_tip(tenant_id)
+        return tip
 
+    @staticmethod
+    def remember_chain_tip(tenant_id, tip, outermost):
+        """Cache a new tip, or drop it if the insert may still roll back."""
+        if not outermost:
+            ActivityLog.forget_chain_tip(tenant_id)
+            return
+        try:
+            cache.set(chain_tip_cache_key(tenant_id), tip, CHAIN_TIP_TTL)
+        except Exception:
+            logger.warning("Audit chain tip cache write failed", exc_info=True)
+            ActivityLog.forget_chain_tip(tenant_id)
+
+    @staticmethod
+    def forget_chain_tip(tenant_id):
+        """Drop a tenant's cached tip, so the next writer reads the tail row."""
+        try:
+            cache.delete(chain_tip_cache_key(tenant_id))
+        except Exception:
+            logger.warning("Audit chain tip cache delete failed", exc_info=True)
+
+    def calculate_hash(self):
+        self.previous_hash = ActivityLog.current_chain_tip(self.tenant_id)
+
+        self.hash_version = HASH_VERSION
+        self.hash = chain_hash(self.previous_hash, self.action, self.target, self.details)
+
+
+class AuditMerkleRoot(models.Model):
+    """
+    Root of the Merkle tree over a tenant's log hashes, covering every log
+    up to and including last_id. Refreshed periodically by
+    apps.audit.merkle.refresh_merkle_root.
+    """
+    tenant = models.OneToOneField(Tenant, on_delete=models.CASCADE, related_name='audit_merkle_root')
+    root_hash = models.BinaryField(max_length=32)
+    height = models.PositiveSmallIntegerField()
+    leaf_count = models.PositiveIntegerField()
+    last_id = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.tenant} - {bytes(self.root_hash).hex()[:8]} ({self.leaf_count} logs)"
+
+
+class AuditMerkleNode(models.Model):
+    """
+    One node of a tenant's stored Merkle tree, so an inclusion proof reads
+    only the log2(N) siblings on its path. Level 0 holds the leaves, each
+    with the id of the log it covers.
+    """
+    # Lookups by tenant use audit_merkle_node_uniq
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name='audit_merkle_nodes', db_index=False
+    )
+    level = models.PositiveSmallIntegerField()
+    position = models.PositiveIntegerField()
+    hash = models.BinaryField(max_length=32)
+    log_id = models.BigIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+             # Finds a log's leaf position
+             models.Index(fields=['tenant', 'log_id'], condition=models.Q(level=0), name='audit_merkle_leaf_idx'),
+        ]
+        constraints = [
+             models.UniqueConstraint(fields=['tenant', 'level', 'position'], name='audit_merkle_node_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant} - level {self.level} #{self.position}"
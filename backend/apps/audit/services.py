@@ -1,4 +1,6 @@
+from django.conf import settings
 from .models import ActivityLog
+from .tasks import record_activity
 
 def log_activity(user, action, target="", details=None, tenant=None):
     """
@@ -19,10 +21,20 @@ def log_activity(user, action, target="", details=None, tenant=None):
         # Should not happen for authenticated users in this system, but safe guard
         return
 
+    actor_name = user.get_full_name()[:255]
+
+    if settings.AUDIT_LOG_ASYNC:
+        record_activity.send(
+            str(tenant.id), str(user.id), action, target, details, user.email, actor_name
+        )
+        return
+
     ActivityLog.objects.create(
         tenant=tenant,
         user=user,
         action=action,
         target=target,
-        details=details
+        details=details,
+        actor_email=user.email,
+        actor_name=actor_name
     )
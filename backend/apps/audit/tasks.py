@@ -0,0 +1,39 @@
+import uuid
+import dramatiq
+from .merkle import refresh_merkle_root
+from apps.authentication.models import User
+from .models import ActivityLog
+
+@dramatiq.actor(queue_name='audit')
+def record_activity(tenant_id, user_id, action, target, details, actor_email='', actor_name=''):
+    """
+    Write an activity log entry using Dramatiq worker.
+    
+    Workers may run concurrently; the chain lock in ActivityLog.save keeps
+    each tenant's chain ordered. Ids arrive as strings, and user_id is None
+    for system actions. The actor's email and name are captured when the
+    message is sent, so a user deleted before it runs is still named.
+    """
+    user_id = uuid.UUID(user_id) if user_id else None
+    if user_id and not User.objects.filter(id=user_id).exists():
+        user_id = None
+
+    ActivityLog.objects.create(
+        tenant_id=uuid.UUID(tenant_id),
+        user_id=user_id,
+        action=action,
+        target=target,
+        details=details,
+        actor_email=actor_email,
+        actor_name=actor_name
+    )
+
+
+@dramatiq.actor(queue_name='audit')
+def refresh_tenant_merkle_root(tenant_id):
+    """
+    Refresh a tenant's audit Merkle tree and root using Dramatiq worker.
+    
+    Enqueued periodically by `manage.py refresh_audit_merkle_roots --enqueue`.
+    """
+    refresh_merkle_root(uuid.UUID(tenant_id))
@@ -6,12 +6,11 @@ multiple logs are created simultaneously, and that tampering is detected.
 """
 
 import pytest
-import hashlib
-import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.db import connection
 
 from apps.audit.models import ActivityLog
+from apps.audit.verifier import verify_chain_integrity
 from apps.authentication.models import Tenant, User
 
 
@@ -30,36 +29,6 @@ def test_user(db, test_tenant):
     )
 
 
-def verify_chain_integrity(tenant):
-    """
-    Verify that the Merkle chain is valid for a tenant.
-    
-    Returns (is_valid, error_message)
-    """
-    logs = ActivityLog.objects.filter(tenant=tenant).order_by('created_at')
-    
-    if not logs.exists():
-        return True, None
-    
-    prev_hash = '0' * 64  # Genesis hash
-    
-    for log in logs:
-        # Verify previous hash link
-        if log.previous_hash != prev_hash:
-            return False, f"Chain broken at log {log.id}: expected prev_hash {prev_hash}, got {log.previous_hash}"
-        
-        # Verify hash calculation
-        data = f"{log.previous_hash}{log.action}{log.target}{json.dumps(log.details, sort_keys=True)}"
-        expected_hash = hashlib.sha256(data.encode('utf-8')).hexdigest()
-        
-        if log.hash != expected_hash:
-            return False, f"Hash mismatch at log {log.id}: expected {expected_hash}, got {log.hash}"
-        
-        prev_hash = log.hash
-    
-    return True, None
-
-
 @pytest.mark.django_db(transaction=True)
 class TestMerkleConcurrency:
     """Tests for Merkle chain integrity under concurrent writes."""
@@ -111,16 +80,87 @@ class TestMerkleConcurrency:
                     # Some may fail due to race conditions - that's what we're testing
                     print(f"Log creation failed: {e}")
         
-        # Verify chain integrity
+        # Verify chain integrity; writers are serialized by the chain lock
+        is_valid, error = verify_chain_integrity(test_tenant)
+        assert is_valid, error
+        
+        assert ActivityLog.objects.filter(tenant=test_tenant).count() == num_logs
+    
+    def test_cached_tip_skips_tail_lookup(self, test_tenant, test_user):
+        """Writes after the first chain from the cached tip, not the tail row."""
+        from django.test.utils import CaptureQueriesContext
+        
+        first = ActivityLog.objects.create(
+            tenant=test_tenant, user=test_user, action='first', target='target'
+        )
+        
+        with CaptureQueriesContext(connection) as ctx:
+            second = ActivityLog.objects.create(
+                tenant=test_tenant, user=test_user, action='second', target='target'
+            )
+        
+        assert second.previous_hash == first.hash
+        assert not any(
+            q['sql'].startswith('SELECT "audit_activitylog"') for q in ctx.captured_queries
+        )
+    
+    def test_rolled_back_log_not_chained(self, test_tenant, test_user):
+        """A log rolled back with its outer transaction is not used as the tip."""
+        from django.db import transaction
+        
+        first = ActivityLog.objects.create(
+            tenant=test_tenant, user=test_user, action='first', target='target'
+        )
+        
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                ActivityLog.objects.create(
+                    tenant=test_tenant, user=test_user, action='rolled_back', target='target'
+                )
+                raise RuntimeError
+        
+        third = ActivityLog.objects.create(
+            tenant=test_tenant, user=test_user, action='third', target='target'
+        )
+        assert third.previous_hash == first.hash
+    
+    def test_writes_survive_cache_outage(self, test_tenant, test_user):
+        """Cache errors fall back to the tail row instead of failing writes."""
+        from unittest.mock import patch
+        
+        first = ActivityLog.objects.create(tenant=test_tenant, user=test_user, action='first')
+        
+        outage = ConnectionError('cache unavailable')
+        with patch('apps.audit.models.cache') as cache:
+            cache.get.side_effect = outage
+            cache.set.side_effect = outage
+            cache.delete.side_effect = outage
+            
+            second = ActivityLog.objects.create(tenant=test_tenant, user=test_user, action='second')
+            appended = ActivityLog.objects.bulk_append(test_tenant, [
+                (f'bulk_{i}', 'target', {}, test_user) for i in range(3)
+            ])
+        
+        assert second.previous_hash == first.hash
+        assert appended[0].previous_hash == second.hash
         is_valid, error = verify_chain_integrity(test_tenant)
+        assert is_valid, error
+    
+    def test_bulk_append_continues_chain(self, test_tenant, test_user):
+        """Bulk appended logs should chain onto the tip and each other."""
+        first = ActivityLog.objects.create(tenant=test_tenant, user=test_user, action='first')
+        
+        appended = ActivityLog.objects.bulk_append(test_tenant, [
+            (f'bulk_{i}', 'target', {'i': i}, test_user) for i in range(5)
+        ])
+        last = ActivityLog.objects.create(tenant=test_tenant, user=test_user, action='last')
         
-        # TODO: After implementing locking, this should always pass
-        # For now, document the current state
-        if not is_valid:
-            print(f"Chain integrity issue (expected before fix): {error}")
+        assert appended[0].previous_hash == first.hash
+        assert bytes(last.previous_hash) == appended[-1].hash
+        assert ActivityLog.objects.filter(tenant=test_tenant).count() == 7
         
-        # At minimum, verify we created some logs
-        assert ActivityLog.objects.filter(tenant=test_tenant).count() > 0
+        is_valid, error = verify_chain_integrity(test_tenant)
+        assert is_valid, error
     
     def test_chain_per_tenant_isolated(self, test_tenant, test_user, db):
         """Each tenant should have its own independent chain."""
@@ -169,7 +209,7 @@ class TestMerkleIntegrity:
             target='first_target'
         )
         
-        assert log.previous_hash == '0' * 64
+        assert log.previous_hash == bytes(32)
     
     def test_subsequent_logs_chain_correctly(self, test_tenant, test_user):
         """Each log should reference previous log's hash."""
@@ -220,7 +260,7 @@ class TestMerkleIntegrity:
         )
         
         # Manually tamper with hash (bypass save protection)
-        ActivityLog.objects.filter(id=log1.id).update(hash='tampered_hash_value')
+        ActivityLog.objects.filter(id=log1.id).update(hash=b'tampered_hash_value')
         
         # Verification should fail
         is_valid, error = verify_chain_integrity(test_tenant)
@@ -285,13 +325,9 @@ class TestChainVerificationUtility:
         import time
         
         # Create 100 logs
-        for i in range(100):
-            ActivityLog.objects.create(
-                tenant=test_tenant,
-                user=test_user,
-                action=f'action_{i}',
-                target=f'target_{i}'
-            )
+        ActivityLog.objects.bulk_append(test_tenant, [
+            (f'action_{i}', f'target_{i}', {}, test_user) for i in range(100)
+        ])
         
         start = time.time()
         is_valid, error = verify_chain_integrity(test_tenant)
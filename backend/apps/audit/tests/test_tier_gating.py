@@ -25,3 +25,111 @@ class AuditTierGatingTest(APITestCase):
         self.client.force_authenticate(user=self.pro_user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_audit_log_user_details(self):
+        from apps.audit.models import ActivityLog
+
+        named_user = User.objects.create_user(
+            email="named@example.com", password="password", tenant=self.pro_tenant,
+            first_name="Ada", last_name="Lovelace"
+        )
+        ActivityLog.objects.create(tenant=self.pro_tenant, user=named_user, action="named")
+        ActivityLog.objects.create(tenant=self.pro_tenant, user=self.pro_user, action="unnamed")
+        ActivityLog.objects.create(tenant=self.pro_tenant, action="system")
+
+        self.client.force_authenticate(user=self.pro_user)
+        response = self.client.get(self.url)
+
+        users = {
+            log['action']: (log['user_name'], log['user_email'])
+            for log in response.data['results']
+        }
+        self.assertEqual(users, {
+            'named': ('Ada Lovelace', 'named@example.com'),
+            'unnamed': ('pro@example.com', 'pro@example.com'),
+            'system': ('System', ''),
+        })
+
+    def test_audit_log_keeps_deleted_user_details(self):
+        from apps.audit.models import ActivityLog
+
+        leaver = User.objects.create_user(
+            email="leaver@example.com", password="password", tenant=self.pro_tenant,
+            first_name="Grace", last_name="Hopper"
+        )
+        ActivityLog.objects.create(tenant=self.pro_tenant, user=leaver, action="left")
+        leaver.delete()
+
+        self.client.force_authenticate(user=self.pro_user)
+        response = self.client.get(self.url)
+
+        log = response.data['results'][0]
+        self.assertIsNone(log['user'])
+        self.assertEqual((log['user_name'], log['user_email']), ('Grace Hopper', 'leaver@example.com'))
+
+    def test_audit_logs_cursor_pagination(self):
+        from apps.audit.models import ActivityLog
+        from apps.audit.views import AuditCursorPagination
+
+        total = AuditCursorPagination.page_size + 5
+        for i in range(total):
+            ActivityLog.objects.create(tenant=self.pro_tenant, action=f"action-{i}")
+
+        self.client.force_authenticate(user=self.pro_user)
+        first = self.client.get(self.url)
+        self.assertEqual(len(first.data['results']), AuditCursorPagination.page_size)
+        self.assertIsNone(first.data['previous'])
+        self.assertEqual(first.data['results'][0]['action'], f"action-{total - 1}")
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+
+        actions = {log['action'] for log in first.data['results'] + second.data['results']}
+        self.assertEqual(len(actions), total)
+
+    def test_audit_log_proof(self):
+        from apps.audit.merkle import refresh_merkle_root, verify_merkle_proof
+        from apps.audit.models import ActivityLog
+
+        logs = [ActivityLog.objects.create(tenant=self.pro_tenant, action=f"action-{i}") for i in range(3)]
+        self.client.force_authenticate(user=self.pro_user)
+        url = f"{self.url}{logs[1].id}/proof/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        refresh_merkle_root(self.pro_tenant.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['leaf_index'], 1)
+        proof = [(step['side'], bytes.fromhex(step['hash'])) for step in response.data['proof']]
+        self.assertTrue(verify_merkle_proof(
+            logs[1].hash, proof, bytes.fromhex(response.data['root'])
+        ))
+
+    def test_audit_log_list_skips_chain_columns(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.audit.models import ActivityLog
+
+        ActivityLog.objects.create(tenant=self.pro_tenant, user=self.pro_user, action="listed")
+
+        self.client.force_authenticate(user=self.pro_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['action'], "listed")
+        log_query = next(q['sql'] for q in queries if 'FROM "audit_activitylog"' in q['sql'])
+        self.assertNotIn('"previous_hash"', log_query)
+
+    def test_audit_logs_filter_by_user(self):
+        from apps.audit.models import ActivityLog
+
+        ActivityLog.objects.create(tenant=self.pro_tenant, user=self.pro_user, action="mine")
+        ActivityLog.objects.create(tenant=self.pro_tenant, action="system")
+
+        self.client.force_authenticate(user=self.pro_user)
+        response = self.client.get(self.url, {'user': self.pro_user.id})
+
+        self.assertEqual([log['action'] for log in response.data['results']], ["mine"])
@@ -0,0 +1,51 @@
+"""
+Merkle chain verification for audit logs.
+"""
+
+from .hashing import GENESIS_HASH, chain_hash
+from .models import ActivityLog
+
+# Rows fetched per round trip while walking a chain
+VERIFY_CHUNK_SIZE = 2000
+
+
+def _hex(digest):
+    return digest.hex() if digest is not None else None
+
+
+def verify_chain_integrity(tenant):
+    """
+    Verify that the Merkle chain is valid for a tenant.
+    
+    Walks the chain in insertion order, streaming only the hashed columns
+    from a single query, and recomputes each link.
+    
+    Returns:
+        (is_valid, error_message)
+    """
+    rows = ActivityLog.objects.filter(tenant=tenant).order_by('id').values_list(
+        'id', 'previous_hash', 'hash', 'hash_version', 'action', 'target', 'details'
+    )
+    
+    prev_hash = GENESIS_HASH
+    
+    for log_id, previous_hash, log_hash, version, action, target, details in rows.iterator(
+        chunk_size=VERIFY_CHUNK_SIZE
+    ):
+        # The driver returns bytea as a memoryview
+        previous_hash = bytes(previous_hash) if previous_hash is not None else None
+        log_hash = bytes(log_hash) if log_hash is not None else None
+        
+        # Verify previous hash link
+        if previous_hash != prev_hash:
+            return False, f"Chain broken at log {log_id}: expected prev_hash {_hex(prev_hash)}, got {_hex(previous_hash)}"
+        
+        # Verify hash calculation
+        expected_hash = chain_hash(previous_hash, action, target, details, version)
+        
+        if log_hash != expected_hash:
+            return False, f"Hash mismatch at log {log_id}: expected {_hex(expected_hash)}, got {_hex(log_hash)}"
+        
+        prev_hash = log_hash
+    
+    return True, None
@@ -1,29 +1,91 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from django.conf import settings
-from django.utils.module_loading import import_string
+from django.db.models import CharField, Value
+from django.db.models.functions import Coalesce, NullIf
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.capabilities import get_capability_service
+from .merkle import build_inclusion_proof
 from .models import ActivityLog
 from .serializers import ActivityLogSerializer
 
+
+class AuditCursorPagination(CursorPagination):
+    """
+    Keyset pagination, newest first. Pages seek on (created_at, id) via the
+    audit_tenant_created_idx index, so deep pages cost the same as the first.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+
+
 class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = AuditCursorPagination
+    filter_backends = [DjangoFilterBackend]
     filterset_fields = {
         'user': ['exact'],
         'created_at': ['gte', 'lte']
     }
-    ordering_fields = ['created_at']
-    ordering = ['-created_at']
+    # Query parameters the filterset reads, from filterset_fields
+    filter_params = ('user', 'created_at__gte', 'created_at__lte')
 
     def get_queryset(self):
         tenant = self.request.user.tenant
         
         # Swappable Capability Check
-        CapabilityService = import_string(settings.CAPABILITY_SERVICE)
+        CapabilityService = get_capability_service()
         
         if not CapabilityService.can_access_audit_logs(tenant):
             raise PermissionDenied("Audit Logs are not available on your current plan.")
             
-        return ActivityLog.objects.filter(tenant=tenant)
+        # The actor is stored on each log, so listing logs needs no join
+        queryset = ActivityLog.objects.filter(tenant=tenant).annotate(
+            user_name=Coalesce(
+                NullIf('actor_name', Value('')),
+                NullIf('actor_email', Value('')),
+                Value('System'),
+                output_field=CharField()
+            )
+        )
+        
+        # The serializer never reads the chain columns, only proofs do
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.defer('hash', 'previous_hash', 'hash_version', 'actor_name')
+        return queryset
+
+    def filter_queryset(self, queryset):
+        # Most requests pass no filters, so skip building the filterset form
+        if not any(param in self.request.query_params for param in self.filter_params):
+            return queryset
+        return super().filter_queryset(queryset)
+
+    @action(detail=True, methods=['get'])
+    def proof(self, request, pk=None):
+        """
+        Merkle inclusion proof for a log against its tenant's stored root.
+        
+        Hashing the log's hash as a leaf, then with each sibling in turn,
+        must give the root.
+        """
+        log = self.get_object()
+        inclusion = build_inclusion_proof(log)
+        if inclusion is None:
+            return Response(
+                {'error': "This log is not yet covered by the tenant's Merkle root"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        merkle_root, leaf_index, proof = inclusion
+        return Response({
+            'log_id': log.id,
+            'hash': log.hash.hex(),
+            'leaf_index': leaf_index,
+            'leaf_count': merkle_root.leaf_count,
+            'root': bytes(merkle_root.root_hash).hex(),
+            'height': merkle_root.height,
+            'proof': [{'side': side, 'hash': sibling.hex()} for side, sibling in proof],
+        })
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_tenant_tier'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tenantinvitation',
+            index=models.Index(fields=['tenant', 'status'], name='tenant_invi_tenant__1a1766_idx'),
+        ),
+    ]
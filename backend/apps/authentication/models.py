@@ -132,6 +132,10 @@ class TenantInvitation(models.Model):
     class Meta:
         db_table = 'tenant_invitations'
         ordering = ['-created_at']
+        indexes = [
+            # Seat counts filter a tenant's invitations by status
+            models.Index(fields=['tenant', 'status']),
+        ]
 
     def __str__(self):
         return f"Invite for {self.email} to {self.tenant.name}"
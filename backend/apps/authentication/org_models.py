@@ -32,13 +32,15 @@ class ContextType(models.Model):
         """Prevent deletion if context type is in use"""
         from apps.config_assets.models import ConfigAsset
         
-        # Check if any assets use this context type
-        assets_count = ConfigAsset.objects.filter(
+        # Check if any assets use this context type; only count them for
+        # the error message
+        assets = ConfigAsset.objects.filter(
             tenant=self.tenant,
             context_type=self.type
-        ).count()
+        )
         
-        if assets_count > 0:
+        if assets.exists():
+            assets_count = assets.count()
             raise ValidationError(
                 f"Cannot delete context type '{self.type}'. "
                 f"It is used by {assets_count} asset(s). "
@@ -74,13 +76,15 @@ class Environment(models.Model):
         """Prevent deletion if environment has config values"""
         from apps.config_assets.models import ConfigValue
         
-        # Check if any config values use this environment
-        values_count = ConfigValue.objects.filter(
+        # Check if any config values use this environment; only count them
+        # for the error message
+        values = ConfigValue.objects.filter(
             config_object__asset__tenant=self.tenant,
             environment=self.slug
-        ).count()
+        )
         
-        if values_count > 0:
+        if values.exists():
+            values_count = values.count()
             raise ValidationError(
                 f"Cannot delete environment '{self.name}'. "
                 f"It contains {values_count} configuration value(s). "
@@ -1,7 +1,11 @@
+import re
 from rest_framework import serializers
 from .org_models import ContextType, Environment
 from .models import Tenant
 
+# Lowercase letters, numbers, hyphens and underscores
+SLUG_RE = re.compile(r'[a-z0-9_-]+')
+
 
 class TenantSerializer(serializers.ModelSerializer):
     class Meta:
@@ -35,8 +39,8 @@ class EnvironmentSerializer(serializers.ModelSerializer):
 
     def validate_slug(self, value):
         """Ensure slug is lowercase and URL-friendly"""
-        if not value.islower():
+        if SLUG_RE.fullmatch(value):
+            return value
+        if SLUG_RE.fullmatch(value.lower()):
             raise serializers.ValidationError("Slug must be lowercase")
-        if not value.replace('-', '').replace('_', '').isalnum():
-            raise serializers.ValidationError("Slug can only contain letters, numbers, hyphens, and underscores")
-        return value
+        raise serializers.ValidationError("Slug can only contain letters, numbers, hyphens, and underscores")
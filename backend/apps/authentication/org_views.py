@@ -1,3 +1,5 @@
+import uuid
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -39,7 +41,7 @@ class TenantViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Tenant not found or access denied'}, status=404)
             
         request.user.current_tenant = tenant
-        request.user.save()
+        request.user.save(update_fields=['current_tenant'])
         return Response({'status': 'switched', 'tenant': TenantSerializer(tenant).data})
 
 
@@ -122,14 +124,22 @@ class EnvironmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update order for each environment
-        for index, env_id in enumerate(environment_ids):
-            try:
-                env = Environment.objects.get(id=env_id, tenant=tenant)
-                env.order = index
-                env.save()
-            except Environment.DoesNotExist:
-                pass
+        try:
+            positions = {uuid.UUID(str(env_id)): index for index, env_id in enumerate(environment_ids)}
+        except ValueError:
+            return Response(
+                {'error': 'Order must be a list of environment IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Update every listed environment in one query; IDs from other
+        # tenants are ignored
+        environments = list(Environment.objects.filter(tenant=tenant, id__in=positions))
+        now = timezone.now()
+        for env in environments:
+            env.order = positions[env.id]
+            env.updated_at = now
+        Environment.objects.bulk_update(environments, ['order', 'updated_at'])
         
         # Return updated list
         environments = Environment.objects.filter(tenant=tenant)
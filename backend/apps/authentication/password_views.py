@@ -1,19 +1,44 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+import re
+import uuid
+
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.encoding import force_bytes, force_str
+from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from .serializers import PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 
 User = get_user_model()
 
+# Tokens from default_token_generator: a base36 timestamp, then 32 hex chars
+# of HMAC
+RESET_TOKEN_RE = re.compile(r'[0-9a-z]{1,13}-[0-9a-f]{32}')
+
+
+def _decode_uid(uidb64):
+    """
+    Decode a reset link's uid back to a user pk.
+
+    Links carry the UUID's 16 raw bytes. Links sent before that carried its
+    text form, which is still accepted until those tokens expire.
+    """
+    raw = urlsafe_base64_decode(uidb64)
+    if len(raw) == 16:
+        return uuid.UUID(bytes=raw)
+    return force_str(raw)
+
+
 class PasswordResetRequestView(generics.GenericAPIView):
     """
     Request a password reset email.
     """
     serializer_class = PasswordResetRequestSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -23,7 +48,8 @@ class PasswordResetRequestView(generics.GenericAPIView):
         try:
             user = User.objects.get(email=email)
             token = default_token_generator.make_token(user)
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
+            # User pks are UUIDs, so encode their raw bytes
+            uid = urlsafe_base64_encode(user.pk.bytes)
             
             # In a real app, send email here
             # For now, we'll print the reset link to the console and return it
@@ -53,6 +79,8 @@ class PasswordResetConfirmView(generics.GenericAPIView):
     """
     serializer_class = PasswordResetConfirmSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'password_reset_confirm'
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -62,13 +90,20 @@ class PasswordResetConfirmView(generics.GenericAPIView):
         uidb64 = serializer.validated_data['uidb64']
         password = serializer.validated_data['password']
 
+        # Malformed tokens can never check out, so skip the user lookup
+        if not RESET_TOKEN_RE.fullmatch(token):
+            return Response(
+                {"error": "Invalid token."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            uid = force_str(urlsafe_base64_decode(uidb64))
+            uid = _decode_uid(uidb64)
             user = User.objects.get(pk=uid)
             
             if default_token_generator.check_token(user, token):
                 user.set_password(password)
-                user.save()
+                user.save(update_fields=['password'])
                 return Response(
                     {"message": "Password has been reset successfully."},
                     status=status.HTTP_200_OK
@@ -78,7 +113,7 @@ class PasswordResetConfirmView(generics.GenericAPIView):
                     {"error": "Invalid or expired token."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+        except (TypeError, ValueError, OverflowError, ValidationError, User.DoesNotExist):
             return Response(
                 {"error": "Invalid token."},
                 status=status.HTTP_400_BAD_REQUEST
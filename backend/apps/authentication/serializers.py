@@ -1,10 +1,26 @@
+import re
+import secrets
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from .models import User, Tenant, TenantMembership, TenantInvitation
 
 
+def _unique_tenant_slug(base_slug):
+    """Return base_slug, or base_slug-N with the lowest free N, in one query."""
+    taken = set(Tenant.objects.filter(
+        slug__regex=rf'^{re.escape(base_slug)}(-[0-9]+)?$'
+    ).values_list('slug', flat=True))
+    
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
 class TenantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tenant
@@ -54,13 +70,18 @@ class RegisterSerializer(serializers.ModelSerializer):
         
         if data.get('invite_token'):
             try:
-                invite = TenantInvitation.objects.get(token=data['invite_token'], status='pending')
+                invite = TenantInvitation.objects.select_related('tenant').get(
+                    token=data['invite_token'], status='pending'
+                )
                 if invite.expires_at < timezone.now():
                     raise serializers.ValidationError({"invite_token": "Invitation has expired."})
                 if invite.email != data['email']:
                     raise serializers.ValidationError({"email": "Email does not match invitation."})
             except TenantInvitation.DoesNotExist:
                 raise serializers.ValidationError({"invite_token": "Invalid invitation token."})
+            
+            # Kept for create(), so the invitation isn't fetched twice
+            data['invite'] = invite
                 
         return data
 
@@ -72,7 +93,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             if invite_token:
                 # Join existing tenant
-                invite = TenantInvitation.objects.get(token=invite_token)
+                invite = validated_data['invite']
                 tenant = invite.tenant
                 role = invite.role
                 
@@ -93,19 +114,21 @@ class RegisterSerializer(serializers.ModelSerializer):
                 
                 # Mark invite accepted
                 invite.status = 'accepted'
-                invite.save()
+                invite.save(update_fields=['status'])
                 
             else:
                 # Create New Tenant
                 # Simple slug generation
-                slug = tenant_name.lower().replace(' ', '-')
-                base_slug = slug
-                counter = 1
-                while Tenant.objects.filter(slug=slug).exists():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                    
-                tenant = Tenant.objects.create(name=tenant_name, slug=slug)
+                base_slug = tenant_name.lower().replace(' ', '-')
+                slug = _unique_tenant_slug(base_slug)
+                try:
+                    with transaction.atomic():
+                        tenant = Tenant.objects.create(name=tenant_name, slug=slug)
+                except IntegrityError:
+                    # Taken by a concurrent registration since the lookup
+                    tenant = Tenant.objects.create(
+                        name=tenant_name, slug=f"{base_slug}-{secrets.token_hex(3)}"
+                    )
                 
                 # Create User
                 user = User.objects.create_user(
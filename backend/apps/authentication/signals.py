@@ -1,23 +1,52 @@
-from django.db.models.signals import post_save
+import logging
+from django.core.cache import cache
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from .models import Tenant
 from .org_models import Environment
 
+logger = logging.getLogger(__name__)
+
+
 @receiver(post_save, sender=Tenant)
 def create_default_environments(sender, instance, created, **kwargs):
     if created:
-        Environment.objects.get_or_create(
-            tenant=instance,
-            slug='local',
-            defaults={'name': 'Local', 'order': 1}
-        )
-        Environment.objects.get_or_create(
-            tenant=instance,
-            slug='stage',
-            defaults={'name': 'Stage', 'order': 2}
-        )
-        Environment.objects.get_or_create(
-            tenant=instance,
-            slug='production',
-            defaults={'name': 'Production', 'order': 3}
+        # One INSERT; environments that already exist are left as they are
+        Environment.objects.bulk_create([
+            Environment(tenant=instance, slug='local', name='Local', order=1),
+            Environment(tenant=instance, slug='stage', name='Stage', order=2),
+            Environment(tenant=instance, slug='production', name='Production', order=3),
+        ], ignore_conflicts=True)
+
+
+@receiver(post_init, sender=Tenant)
+def remember_tenant_slug(sender, instance, **kwargs):
+    """Keep the slug the tenant was loaded with, to invalidate it on rename."""
+    # Read from __dict__ so tenants loaded without their slug don't fetch it
+    instance._original_slug = instance.__dict__.get('slug')
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def invalidate_tenant_cache(sender, instance, **kwargs):
+    """
+    Drop the tenant row cached by slug for the public API values endpoints.
+    
+    Cache keys invalidated:
+    1. tenant:{slug}
+    2. tenant:{old_slug} (after a rename)
+    """
+    slugs = {instance.slug, instance._original_slug} - {None}
+    try:
+        cache.delete_many([f"tenant:{slug}" for slug in slugs])
+        
+    except Exception as e:
+        # Don't block save on cache error, but log it
+        logger.error(
+            f"Cache invalidation error for Tenant: {e}",
+            exc_info=True,
+            extra={
+                'tenant_id': str(instance.id),
+                'error': str(e)
+            }
         )
+    instance._original_slug = instance.slug
@@ -0,0 +1,11 @@
+import dramatiq
+from .email_service import send_invitation_email
+
+@dramatiq.actor
+def send_invitation_email_task(email, invite_link, inviter_name=None):
+    """
+    Send an invitation email using Dramatiq worker.
+    
+    Enqueued by the invitation endpoints when settings.EMAIL_ASYNC is on.
+    """
+    send_invitation_email(email, invite_link, inviter_name)
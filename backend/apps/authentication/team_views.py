@@ -5,9 +5,56 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.conf import settings
-from django.utils.module_loading import import_string
-from .models import TenantMembership, TenantInvitation
+from django.db import transaction
+from django.db.models import Count, Exists, Q
+from apps.core.capabilities import get_capability_service
+from .email_service import send_invitation_email
+from .models import Tenant, TenantMembership, TenantInvitation
 from .serializers import TenantMembershipSerializer, TenantInvitationSerializer
+from .tasks import send_invitation_email_task
+
+
+# Columns UserSerializer reads, including its nested tenants
+USER_LIST_FIELDS = (
+    'id', 'email', 'username', 'first_name', 'last_name', 'role',
+    'tenant__id', 'tenant__name', 'tenant__slug',
+    'current_tenant__id', 'current_tenant__name', 'current_tenant__slug',
+)
+
+
+def _user_list_fields(relation):
+    return [f'{relation}__{field}' for field in USER_LIST_FIELDS]
+
+
+def _deliver_invitation(email, invite_url, inviter_name):
+    """
+    Send an invitation email, or hand it to a worker when EMAIL_ASYNC is on.
+    
+    Returns:
+        Response fields reporting the delivery
+    """
+    if settings.EMAIL_ASYNC:
+        send_invitation_email_task.send(email, invite_url, inviter_name)
+        return {'email_queued': True}
+    return {'email_sent': send_invitation_email(email, invite_url, inviter_name)}
+
+
+def _lock_tenant_admins(tenant_id):
+    """Serialize admin demotions and removals within a tenant."""
+    Tenant.objects.select_for_update().only('id').get(pk=tenant_id)
+
+
+def _leaves_an_admin(membership):
+    """
+    The membership, if it can stop being an admin without leaving its tenant
+    without one.
+    """
+    other_admins = TenantMembership.objects.filter(
+        tenant_id=membership.tenant_id, role='admin'
+    ).exclude(pk=membership.pk)
+    return TenantMembership.objects.filter(pk=membership.pk).filter(
+        ~Q(role='admin') | Exists(other_admins)
+    )
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -24,7 +71,13 @@ class TenantMembershipViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Get current tenant from user
         tenant = self.request.user.current_tenant or self.request.user.tenant
-        return TenantMembership.objects.filter(tenant=tenant).select_related('user')
+        # UserSerializer nests both of the user's tenants
+        queryset = TenantMembership.objects.filter(tenant=tenant).select_related(
+            'user', 'user__tenant', 'user__current_tenant'
+        )
+        if self.action == 'list':
+            queryset = queryset.only('id', 'role', 'joined_at', *_user_list_fields('user'))
+        return queryset
     
     def get_permissions(self):
         # Only admins can create, update, or delete memberships
@@ -43,16 +96,16 @@ class TenantMembershipViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Prevent removing the last admin
-        tenant = request.user.current_tenant or request.user.tenant
-        admin_count = TenantMembership.objects.filter(tenant=tenant, role='admin').count()
-        if membership.role == 'admin' and admin_count <= 1:
+        # Prevent removing the last admin; the check is part of the DELETE
+        with transaction.atomic():
+            _lock_tenant_admins(membership.tenant_id)
+            deleted, _ = _leaves_an_admin(membership).delete()
+        if not deleted:
             return Response(
                 {"error": "Cannot remove the last admin from the organization."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        membership.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def update(self, request, *args, **kwargs):
@@ -66,17 +119,27 @@ class TenantMembershipViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Prevent demoting the last admin
-        tenant = request.user.current_tenant or request.user.tenant
-        if membership.role == 'admin' and request.data.get('role') != 'admin':
-            admin_count = TenantMembership.objects.filter(tenant=tenant, role='admin').count()
-            if admin_count <= 1:
+        serializer = self.get_serializer(
+            membership, data=request.data, partial=kwargs.get('partial', False)
+        )
+        serializer.is_valid(raise_exception=True)
+        role = serializer.validated_data.get('role', membership.role)
+        
+        # Prevent demoting the last admin; the check is part of the UPDATE
+        if role == 'admin':
+            TenantMembership.objects.filter(pk=membership.pk).update(role=role)
+        else:
+            with transaction.atomic():
+                _lock_tenant_admins(membership.tenant_id)
+                updated = _leaves_an_admin(membership).update(role=role)
+            if not updated:
                 return Response(
                     {"error": "Cannot demote the last admin."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        return super().update(request, *args, **kwargs)
+        membership.role = role
+        return Response(self.get_serializer(membership).data)
 
 
 class TenantInvitationViewSet(viewsets.ModelViewSet):
@@ -86,7 +149,15 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         tenant = self.request.user.current_tenant or self.request.user.tenant
-        return TenantInvitation.objects.filter(tenant=tenant)
+        queryset = TenantInvitation.objects.filter(tenant=tenant).select_related(
+            'invited_by', 'invited_by__tenant', 'invited_by__current_tenant'
+        )
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id', 'email', 'role', 'status', 'created_at', 'expires_at',
+                *_user_list_fields('invited_by')
+            )
+        return queryset
     
     def create(self, request, *args, **kwargs):
         """Create a new invitation"""
@@ -95,12 +166,21 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
         tenant = request.user.current_tenant or request.user.tenant
         
         # --- Feature Gate: Team Size ---
-        CapabilityService = import_string(settings.CAPABILITY_SERVICE)
+        CapabilityService = get_capability_service()
         max_seats = CapabilityService.get_max_seats(tenant)
         
-        current_members = TenantMembership.objects.filter(tenant=tenant).count()
-        pending_invites = TenantInvitation.objects.filter(tenant=tenant, status='pending').count()
-        total_seats_used = current_members + pending_invites
+        # Members and pending invites both take a seat. Each count also checks
+        # whether this email is already a member or invited. They're counted
+        # separately, as joining the two would scan members x invitations.
+        members = TenantMembership.objects.filter(tenant=tenant).aggregate(
+            count=Count('id'),
+            email=Count('id', filter=Q(user__email=email))
+        )
+        invites = TenantInvitation.objects.filter(tenant=tenant, status='pending').aggregate(
+            count=Count('id'),
+            email=Count('id', filter=Q(email=email))
+        )
+        total_seats_used = members['count'] + invites['count']
         
         if total_seats_used >= max_seats:
              return Response(
@@ -110,25 +190,14 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
         # -------------------------------
         
         # Check if user already exists in this tenant
-        from .models import User
-        try:
-            user = User.objects.get(email=email)
-            if TenantMembership.objects.filter(user=user, tenant=tenant).exists():
-                return Response(
-                    {"error": "User is already a member of this organization."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except User.DoesNotExist:
-            pass
+        if members['email']:
+            return Response(
+                {"error": "User is already a member of this organization."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Check for existing pending invitation
-        existing_invite = TenantInvitation.objects.filter(
-            tenant=tenant,
-            email=email,
-            status='pending'
-        ).first()
-        
-        if existing_invite:
+        if invites['email']:
             return Response(
                 {"error": "An invitation has already been sent to this email."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -148,16 +217,13 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
         )
         
         # Send email with invitation link
-        from django.conf import settings
-        from .email_service import send_invitation_email
-        
         invite_url = f"{settings.FRONTEND_URL}/register?token={token}"
-        email_sent = send_invitation_email(email, invite_url, request.user.first_name or request.user.email)
+        delivery = _deliver_invitation(email, invite_url, request.user.first_name or request.user.email)
         
         serializer = self.get_serializer(invitation)
         response_data = serializer.data
         response_data['invite_url'] = invite_url
-        response_data['email_sent'] = email_sent
+        response_data.update(delivery)
         
         return Response(response_data, status=status.HTTP_201_CREATED)
     
@@ -174,16 +240,13 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
         
         # Extend expiration
         invitation.expires_at = timezone.now() + timedelta(days=7)
-        invitation.save()
+        invitation.save(update_fields=['expires_at'])
         
         # Send email
-        from django.conf import settings
-        from .email_service import send_invitation_email
-        
         invite_url = f"{settings.FRONTEND_URL}/register?token={invitation.token}"
-        email_sent = send_invitation_email(invitation.email, invite_url, request.user.first_name or request.user.email)
+        delivery = _deliver_invitation(invitation.email, invite_url, request.user.first_name or request.user.email)
         
-        return Response({"message": "Invitation resent successfully.", "email_sent": email_sent})
+        return Response({"message": "Invitation resent successfully.", **delivery})
     
     def destroy(self, request, *args, **kwargs):
         """Revoke an invitation"""
@@ -196,6 +259,6 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
             )
         
         invitation.status = 'expired'
-        invitation.save()
+        invitation.save(update_fields=['status'])
         
         return Response(status=status.HTTP_204_NO_CONTENT)
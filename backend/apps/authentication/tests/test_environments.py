@@ -0,0 +1,76 @@
+from rest_framework.test import APITestCase
+from apps.authentication.models import User, Tenant
+from apps.authentication.org_models import Environment
+
+class EnvironmentReorderTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Tenant A', slug='tenant-a')
+        self.other_tenant = Tenant.objects.create(name='Tenant B', slug='tenant-b')
+        self.user = User.objects.create_user(email='user_a@example.com', password='password', tenant=self.tenant, current_tenant=self.tenant)
+        self.url = '/api/organization/environments/reorder/'
+
+    def test_reorder_environments(self):
+        # Tenants are created with their default environments
+        environments = list(Environment.objects.filter(tenant=self.tenant))
+        other_env = Environment.objects.filter(tenant=self.other_tenant).last()
+        other_order = other_env.order
+        new_order = [env.id for env in reversed(environments)]
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'order': [str(env_id) for env_id in new_order] + [str(other_env.id)]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([env['id'] for env in response.data], [str(env_id) for env_id in new_order])
+        other_env.refresh_from_db()
+        self.assertEqual(other_env.order, other_order)
+
+    def test_reorder_rejects_invalid_ids(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'order': ['not-a-uuid']}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_environment_with_values_cannot_be_deleted(self):
+        from django.core.exceptions import ValidationError
+        from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
+
+        env = Environment.objects.filter(tenant=self.tenant).first()
+        asset = ConfigAsset.objects.create(tenant=self.tenant, name='Asset', slug='asset')
+        config_object = ConfigObject.objects.create(asset=asset, name='Object', object_type='kv')
+        ConfigValue.objects.create(config_object=config_object, key='key', environment=env.slug, value_string='value')
+
+        with self.assertRaisesMessage(ValidationError, 'It contains 1 configuration value(s)'):
+            env.delete()
+
+        ConfigValue.objects.all().delete()
+        env.delete()
+        self.assertFalse(Environment.objects.filter(pk=env.pk).exists())
+
+    def test_new_tenant_gets_default_environments(self):
+        tenant = Tenant.objects.create(name='Tenant C', slug='tenant-c')
+        self.assertEqual(
+            list(Environment.objects.filter(tenant=tenant).values_list('slug', 'order')),
+            [('local', 1), ('stage', 2), ('production', 3)]
+        )
+
+    def test_environment_slug_validation(self):
+        self.client.force_authenticate(user=self.user)
+        url = '/api/organization/environments/'
+
+        response = self.client.post(url, {'name': 'QA', 'slug': 'QA'}, format='json')
+        self.assertEqual(response.data['slug'], ['Slug must be lowercase'])
+
+        response = self.client.post(url, {'name': 'QA', 'slug': 'qa_2-east'}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_jwt_user_loads_tenants_with_user(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/organization/environments/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if q['sql'].startswith('SELECT "tenants"')])
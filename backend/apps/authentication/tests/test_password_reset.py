@@ -0,0 +1,59 @@
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APITestCase
+from apps.authentication.models import Tenant, User
+
+
+class PasswordResetTests(APITestCase):
+    def setUp(self):
+        # Throttle history lives in the cache
+        cache.clear()
+        tenant = Tenant.objects.create(name='Acme', slug='acme')
+        self.user = User.objects.create_user(
+            username='reset@example.com', email='reset@example.com',
+            password='Old-password-1', tenant=tenant
+        )
+
+    def confirm(self, uidb64, token):
+        return self.client.post('/api/auth/password-reset/confirm/', {
+            'uidb64': uidb64,
+            'token': token,
+            'password': 'New-password-1',
+        }, format='json')
+
+    def test_reset_link_round_trips(self):
+        response = self.client.post(
+            '/api/auth/password-reset/', {'email': 'reset@example.com'}, format='json'
+        )
+        params = parse_qs(urlparse(response.data['mock_link']).query)
+        self.assertEqual(params['uid'][0], urlsafe_base64_encode(self.user.pk.bytes))
+
+        response = self.confirm(params['uid'][0], params['token'][0])
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('New-password-1'))
+
+    def test_text_uid_links_still_accepted(self):
+        uidb64 = urlsafe_base64_encode(force_bytes(self.user.pk))
+        response = self.confirm(uidb64, default_token_generator.make_token(self.user))
+        self.assertEqual(response.status_code, 200)
+
+    def test_malformed_token_skips_user_lookup(self):
+        uidb64 = urlsafe_base64_encode(self.user.pk.bytes)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.confirm(uidb64, 'not-a-token')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse([q for q in queries if '"users"' in q['sql']])
+
+    def test_confirm_is_throttled(self):
+        uidb64 = urlsafe_base64_encode(self.user.pk.bytes)
+        for _ in range(5):
+            self.assertEqual(self.confirm(uidb64, 'not-a-token').status_code, 400)
+        self.assertEqual(self.confirm(uidb64, 'not-a-token').status_code, 429)
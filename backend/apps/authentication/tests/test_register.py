@@ -0,0 +1,50 @@
+from rest_framework.test import APITestCase
+from apps.authentication.models import Tenant
+
+class RegisterTenantSlugTests(APITestCase):
+    def register(self, email, tenant_name):
+        return self.client.post('/api/auth/register/', {
+            'email': email,
+            'password': 'Str0ng-password!',
+            'tenant_name': tenant_name,
+        }, format='json')
+
+    def test_taken_slugs_get_next_free_suffix(self):
+        Tenant.objects.create(name='Acme', slug='acme')
+        Tenant.objects.create(name='Acme', slug='acme-1')
+        Tenant.objects.create(name='Acme Corp', slug='acme-corp')
+
+        response = self.register('first@example.com', 'Acme')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['user']['tenant']['slug'], 'acme-2')
+
+    def test_free_slug_is_used_as_is(self):
+        response = self.register('first@example.com', 'New Org')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['user']['tenant']['slug'], 'new-org')
+
+    def test_register_with_invitation_joins_tenant(self):
+        from datetime import timedelta
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        from apps.authentication.models import TenantInvitation
+
+        tenant = Tenant.objects.create(name='Acme', slug='acme')
+        invite = TenantInvitation.objects.create(
+            tenant=tenant, email='invited@example.com', role='user', token='invite-token',
+            expires_at=timezone.now() + timedelta(days=7)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/auth/register/', {
+                'email': 'invited@example.com',
+                'password': 'Str0ng-password!',
+                'invite_token': 'invite-token',
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['user']['tenant']['slug'], 'acme')
+        invite.refresh_from_db()
+        self.assertEqual(invite.status, 'accepted')
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('SELECT') and 'tenant_invitations' in q['sql']]), 1)
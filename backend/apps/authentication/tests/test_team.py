@@ -0,0 +1,146 @@
+from unittest.mock import patch
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from apps.authentication.models import User, Tenant, TenantMembership
+from apps.authentication.tasks import send_invitation_email_task
+from apps.core.capabilities import get_capability_service
+
+class TeamMembersQueryTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Tenant A', slug='tenant-a')
+        self.user = User.objects.create_user(email='admin@example.com', password='password', tenant=self.tenant, current_tenant=self.tenant, role='admin')
+        TenantMembership.objects.create(user=self.user, tenant=self.tenant, role='admin')
+
+    def add_members(self, count):
+        start = TenantMembership.objects.count()
+        for i in range(start, start + count):
+            member = User.objects.create_user(email=f'member{i}@example.com', password='password', tenant=self.tenant, current_tenant=self.tenant)
+            TenantMembership.objects.create(user=member, tenant=self.tenant)
+
+    def test_member_list_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.user)
+        self.add_members(1)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/api/team/members/')
+
+        self.add_members(5)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get('/api/team/members/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(many), len(few))
+
+
+class TeamInvitationSeatTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Tenant A', slug='tenant-a', tier='pro')
+        self.user = User.objects.create_user(email='admin@example.com', password='password', tenant=self.tenant, current_tenant=self.tenant, role='admin')
+        TenantMembership.objects.create(user=self.user, tenant=self.tenant, role='admin')
+        self.url = '/api/team/invitations/'
+
+    def invite(self, email):
+        self.client.force_authenticate(user=self.user)
+        return self.client.post(self.url, {'email': email}, format='json')
+
+    def test_pending_invites_count_towards_seats(self):
+        with patch.object(get_capability_service(), 'get_max_seats', return_value=2):
+            self.assertEqual(self.invite('first@example.com').status_code, 201)
+            response = self.invite('second@example.com')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('Plan limit reached', response.data['error'])
+
+    def test_existing_member_cannot_be_invited(self):
+        response = self.invite('admin@example.com')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invitation_list_skips_tokens(self):
+        self.invite('first@example.com')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['invited_by']['email'], 'admin@example.com')
+        invitation_query = next(q['sql'] for q in queries if 'FROM "tenant_invitations"' in q['sql'])
+        self.assertNotIn('"token"', invitation_query)
+        self.assertNotIn('"password"', invitation_query)
+
+    def test_email_cannot_be_invited_twice(self):
+        self.assertEqual(self.invite('first@example.com').status_code, 201)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.invite('first@example.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already been sent', response.data['error'])
+        # Seats and duplicates are checked by one count per table, and
+        # memberships are never joined to invitations
+        invitation_queries = [q['sql'] for q in queries if 'tenant_invitations' in q['sql']]
+        self.assertEqual(len(invitation_queries), 1)
+        self.assertNotIn('tenant_memberships', invitation_queries[0])
+
+    @override_settings(EMAIL_ASYNC=True)
+    def test_invitation_email_queued_when_async(self):
+        with patch.object(send_invitation_email_task, 'send') as send:
+            response = self.invite('queued@example.com')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['email_queued'])
+        send.assert_called_once_with('queued@example.com', response.data['invite_url'], 'admin@example.com')
+
+
+    def test_revoke_only_updates_status(self):
+        invitation_id = self.invite('first@example.com').data['id']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'{self.url}{invitation_id}/')
+
+        self.assertEqual(response.status_code, 204)
+        update = next(q['sql'] for q in queries if q['sql'].startswith('UPDATE "tenant_invitations"'))
+        self.assertIn('SET "status"', update)
+        self.assertNotIn('"token"', update)
+
+class TeamMemberRoleTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Tenant A', slug='tenant-a')
+        # Admin by user role, without an admin membership of their own
+        self.user = User.objects.create_user(email='owner@example.com', password='password', tenant=self.tenant, current_tenant=self.tenant, role='admin')
+        TenantMembership.objects.create(user=self.user, tenant=self.tenant, role='user')
+        self.admin = self.add_member('admin@example.com', 'admin')
+        self.member = self.add_member('member@example.com', 'user')
+        self.client.force_authenticate(user=self.user)
+
+    def add_member(self, email, role):
+        user = User.objects.create_user(email=email, password='password', tenant=self.tenant, current_tenant=self.tenant)
+        return TenantMembership.objects.create(user=user, tenant=self.tenant, role=role)
+
+    def url(self, membership):
+        return f'/api/team/members/{membership.pk}/'
+
+    def test_cannot_demote_last_admin(self):
+        response = self.client.patch(self.url(self.admin), {'role': 'user'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.role, 'admin')
+
+    def test_demote_admin_when_another_remains(self):
+        self.client.patch(self.url(self.member), {'role': 'admin'}, format='json')
+        response = self.client.patch(self.url(self.admin), {'role': 'user'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['role'], 'user')
+        self.assertEqual(
+            list(TenantMembership.objects.filter(role='admin').values_list('pk', flat=True)),
+            [self.member.pk]
+        )
+
+    def test_cannot_remove_last_admin(self):
+        response = self.client.delete(self.url(self.admin))
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.delete(self.url(self.member))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(TenantMembership.objects.filter(pk=self.member.pk).exists())
@@ -77,7 +77,7 @@ class ChangePasswordView(generics.UpdateAPIView):
 
         # Set new password
         user.set_password(serializer.data.get("new_password"))
-        user.save()
+        user.save(update_fields=['password'])
         
         return Response(
             {"message": "Password updated successfully"},
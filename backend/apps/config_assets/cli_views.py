@@ -1,5 +1,6 @@
 """CLI-specific API views for ConfigMat."""
 
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -37,14 +38,21 @@ class CLIOrganizationAssetsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Get all assets for this tenant
-        assets = ConfigAsset.objects.filter(tenant=tenant).order_by('name')
+        # Get all assets for this tenant, with every asset's objects in one
+        # more query
+        assets = ConfigAsset.objects.filter(tenant=tenant).order_by('name').only(
+            'id', 'slug', 'name', 'description', 'context', 'context_type'
+        ).prefetch_related(Prefetch(
+            'config_objects',
+            queryset=ConfigObject.objects.only(
+                'id', 'asset_id', 'name', 'object_type', 'description'
+            ).order_by('name'),
+            to_attr='cli_objects'
+        ))
         
         # Serialize with nested objects
         assets_data = []
         for asset in assets:
-            objects = ConfigObject.objects.filter(asset=asset).order_by('name')
-            
             assets_data.append({
                 "id": str(asset.id),
                 "slug": asset.slug,
@@ -60,7 +68,7 @@ class CLIOrganizationAssetsView(APIView):
                         "type": obj.object_type,
                         "description": obj.description or ""
                     }
-                    for obj in objects
+                    for obj in asset.cli_objects
                 ]
             })
 
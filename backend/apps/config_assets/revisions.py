@@ -0,0 +1,62 @@
+"""
+Generational cache invalidation for config values.
+
+Every cached values response for an (tenant, asset, environment) stores the
+revision it was built at. A write bumps the revision, which invalidates
+the list response and every per-key detail response at once, without
+having to know which of those keys are cached.
+"""
+
+import time
+from django.core.cache import cache
+
+# Long enough that revisions outlive the 5 minute payloads they guard. An
+# expired revision restarts from the clock, so it never reuses a value.
+REVISION_TTL = 24 * 60 * 60
+
+
+def values_revision_key(tenant_slug, asset_slug, environment):
+    return f"rev:{tenant_slug}:{asset_slug}:{environment}"
+
+
+def _initial_revision():
+    return int(time.time() * 1000)
+
+
+def get_values_revision(tenant_slug, asset_slug, environment):
+    """Return the current revision, starting one if none exists."""
+    return cache.get_or_set(
+        values_revision_key(tenant_slug, asset_slug, environment),
+        _initial_revision,
+        REVISION_TTL
+    )
+
+
+def bump_values_revision(tenant_slug, asset_slug, environment):
+    """Invalidate every cached values response for the asset and environment."""
+    key = values_revision_key(tenant_slug, asset_slug, environment)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No revision yet, so nothing cached under one either
+        cache.set(key, _initial_revision(), REVISION_TTL)
+
+
+def get_cached_values(tenant_slug, asset_slug, environment, cache_key):
+    """
+    Fetch the current revision and a cached response in one round trip.
+    
+    Returns (revision, entry), where entry is None unless it was cached at
+    the current revision. New entries should be stored with this revision.
+    """
+    rev_key = values_revision_key(tenant_slug, asset_slug, environment)
+    found = cache.get_many([rev_key, cache_key])
+    
+    revision = found.get(rev_key)
+    if revision is None:
+        revision = get_values_revision(tenant_slug, asset_slug, environment)
+    
+    entry = found.get(cache_key)
+    if entry is None or entry['rev'] != revision:
+        return revision, None
+    return revision, entry
@@ -1,18 +1,25 @@
 import logging
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
-from .models import ConfigValue, ConfigObject
+from .models import ConfigValue, ConfigObject, ConfigAsset
+from .revisions import bump_values_revision
 
 logger = logging.getLogger(__name__)
 
+# Environments whose cached values are invalidated when an object or asset
+# changes. For production with many environments, consider tracking active
+# environments in the tenant model.
+KNOWN_ENVIRONMENTS = ('local', 'stage', 'prod', 'production')
+
 
 @receiver([post_save, post_delete], sender=ConfigValue)
 def invalidate_value_cache(sender, instance, **kwargs):
     """
     Invalidate cache when a ConfigValue changes.
     
-    Cache keys invalidated:
+    Bumps the values revision for the asset and environment, which retires
+    both cached responses at once:
     1. config:{tenant}:{asset}:{env} (Full asset values)
     2. config:{tenant}:{asset}:{object}:{key}:{env} (Specific value)
     """
@@ -22,13 +29,7 @@ def invalidate_value_cache(sender, instance, **kwargs):
         tenant = asset.tenant
         env = instance.environment
         
-        # Pattern 1: Full Asset
-        key1 = f"config:{tenant.slug}:{asset.slug}:{env}"
-        cache.delete(key1)
-        
-        # Pattern 2: Specific Value
-        key2 = f"config:{tenant.slug}:{asset.slug}:{config_object.name}:{instance.key}:{env}"
-        cache.delete(key2)
+        bump_values_revision(tenant.slug, asset.slug, env)
         
         logger.debug(
             "Cache invalidated for config value change",
@@ -66,15 +67,11 @@ def invalidate_object_cache(sender, instance, **kwargs):
         tenant = asset.tenant
         
         # Invalidate all known environments
-        # Note: For production with many environments, consider tracking
-        # active environments in the tenant model
-        envs = ['local', 'stage', 'prod', 'production']
-        invalidated_keys = []
+        for env in KNOWN_ENVIRONMENTS:
+            bump_values_revision(tenant.slug, asset.slug, env)
         
-        for env in envs:
-            key = f"config:{tenant.slug}:{asset.slug}:{env}"
-            cache.delete(key)
-            invalidated_keys.append(key)
+        # Asset detail lists the asset's objects
+        cache.delete(f"assets:{tenant.slug}:{asset.slug}")
         
         logger.debug(
             "Cache invalidated for config object change",
@@ -82,7 +79,7 @@ def invalidate_object_cache(sender, instance, **kwargs):
                 'tenant_slug': tenant.slug,
                 'asset_slug': asset.slug,
                 'config_object': instance.name,
-                'invalidated_keys': invalidated_keys
+                'environments': KNOWN_ENVIRONMENTS
             }
         )
              
@@ -96,3 +93,58 @@ def invalidate_object_cache(sender, instance, **kwargs):
                 'error': str(e)
             }
         )
+
+
+@receiver(post_init, sender=ConfigAsset)
+def remember_asset_slug(sender, instance, **kwargs):
+    """Keep the slug the asset was loaded with, to invalidate it on rename."""
+    # Read from __dict__ so assets loaded without their slug don't fetch it
+    instance._original_slug = instance.__dict__.get('slug')
+
+
+@receiver([post_save, post_delete], sender=ConfigAsset)
+def invalidate_asset_cache(sender, instance, **kwargs):
+    """
+    Invalidate the public API asset caches when an Asset changes.
+    
+    Cache keys invalidated, for the current slug and, after a rename, the
+    old one:
+    1. assets:{tenant} (Asset list)
+    2. assets:{tenant}:{asset} (Asset detail)
+    3. asset:{tenant}:{asset} (Asset row used by the values endpoints)
+    
+    A renamed asset's values cached under its old slug are retired too.
+    """
+    try:
+        tenant = instance.tenant
+        slugs = {instance.slug, instance._original_slug} - {None}
+        cache.delete_many([f"assets:{tenant.slug}"] + [
+            key
+            for slug in slugs
+            for key in (f"assets:{tenant.slug}:{slug}", f"asset:{tenant.slug}:{slug}")
+        ])
+        
+        old_slug = instance._original_slug
+        if old_slug and old_slug != instance.slug:
+            for env in KNOWN_ENVIRONMENTS:
+                bump_values_revision(tenant.slug, old_slug, env)
+        
+        logger.debug(
+            "Cache invalidated for config asset change",
+            extra={
+                'tenant_slug': tenant.slug,
+                'asset_slug': instance.slug,
+            }
+        )
+        
+    except Exception as e:
+        # Don't block save on cache error, but log it
+        logger.error(
+            f"Cache invalidation error for ConfigAsset: {e}",
+            exc_info=True,
+            extra={
+                'config_asset_id': str(instance.id) if instance.id else 'new',
+                'error': str(e)
+            }
+        )
+    instance._original_slug = instance.slug
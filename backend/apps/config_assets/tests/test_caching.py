@@ -3,6 +3,7 @@ from django.core.cache import cache
 from unittest.mock import patch
 from apps.authentication.models import Tenant
 from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
+from apps.config_assets.revisions import get_cached_values, get_values_revision
 
 class CachingTests(TestCase):
     def setUp(self):
@@ -15,26 +16,82 @@ class CachingTests(TestCase):
             environment='local',
             value_string='initial'
         )
-        self.cache_key = f"config:{self.tenant.slug}:{self.asset.slug}:local"
         
         # Clear cache
         cache.clear()
 
+    def current_revision(self, env='local'):
+        return get_values_revision(self.tenant.slug, self.asset.slug, env)
+
     def test_cache_invalidation_on_update(self):
-        # 1. Update value, should invalidate asset cache
-        # Set a dummy value in cache first to simulate checking
-        cache.set(self.cache_key, {'foo': 'bar'})
-        self.assertIsNotNone(cache.get(self.cache_key))
+        # 1. Update value, should retire cached responses for the asset
+        revision = self.current_revision()
         
         # Save
         self.value.value_string = 'updated'
         self.value.save()
         
-        # Check cache is cleared
-        self.assertIsNone(cache.get(self.cache_key))
+        # Check the revision moved on
+        self.assertNotEqual(self.current_revision(), revision)
 
     def test_cache_invalidation_on_delete(self):
-        cache.set(self.cache_key, {'foo': 'bar'})
+        revision = self.current_revision()
         
         self.value.delete()
-        self.assertIsNone(cache.get(self.cache_key))
+        self.assertNotEqual(self.current_revision(), revision)
+
+    def test_cache_invalidation_on_object_change(self):
+        revisions = {env: self.current_revision(env) for env in ('local', 'prod')}
+        
+        self.object.name = 'Renamed Object'
+        self.object.save()
+        for env, revision in revisions.items():
+            self.assertNotEqual(self.current_revision(env), revision)
+
+    def test_cached_entry_from_older_revision_is_ignored(self):
+        cache_key = f"config:{self.tenant.slug}:{self.asset.slug}:local"
+        revision = self.current_revision()
+        cache.set(cache_key, {'rev': revision, 'body': b'{}'})
+        
+        found = get_cached_values(self.tenant.slug, self.asset.slug, 'local', cache_key)
+        self.assertEqual(found, (revision, {'rev': revision, 'body': b'{}'}))
+        
+        self.value.delete()
+        new_revision, entry = get_cached_values(self.tenant.slug, self.asset.slug, 'local', cache_key)
+        self.assertNotEqual(new_revision, revision)
+        self.assertIsNone(entry)
+
+    def test_asset_detail_cache_invalidation_on_object_change(self):
+        detail_key = f"assets:{self.tenant.slug}:{self.asset.slug}"
+        cache.set(detail_key, {'foo': 'bar'})
+        
+        ConfigObject.objects.create(asset=self.asset, name='Other Object', object_type='kv')
+        self.assertIsNone(cache.get(detail_key))
+
+    def test_asset_rename_invalidates_old_slug(self):
+        old_keys = [f"asset:{self.tenant.slug}:cache-asset", f"assets:{self.tenant.slug}:cache-asset"]
+        cache.set_many({key: 'stale' for key in old_keys})
+        revision = self.current_revision()
+        
+        asset = ConfigAsset.objects.get(pk=self.asset.pk)
+        asset.slug = 'renamed-asset'
+        asset.save()
+        
+        self.assertEqual(cache.get_many(old_keys), {})
+        self.assertNotEqual(get_values_revision(self.tenant.slug, 'cache-asset', 'local'), revision)
+
+    def test_tenant_rename_invalidates_old_slug(self):
+        cache.set_many({'tenant:cache-tenant': 'stale', 'tenant:renamed-tenant': 'stale'})
+        
+        tenant = Tenant.objects.get(pk=self.tenant.pk)
+        tenant.slug = 'renamed-tenant'
+        tenant.save()
+        
+        self.assertEqual(cache.get_many(['tenant:cache-tenant', 'tenant:renamed-tenant']), {})
+
+    def test_tenant_save_survives_cache_outage(self):
+        with patch('apps.authentication.signals.cache.delete_many', side_effect=ConnectionError):
+            self.tenant.name = 'Renamed Tenant'
+            self.tenant.save()
+        
+        self.assertEqual(Tenant.objects.get(pk=self.tenant.pk).name, 'Renamed Tenant')
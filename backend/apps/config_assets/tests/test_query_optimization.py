@@ -8,7 +8,10 @@ N+1 query patterns that would degrade performance at scale.
 import pytest
 from django.test.utils import CaptureQueriesContext
 from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.api_keys.models import APIKey
 from apps.authentication.models import Tenant, User
 from apps.config_assets.models import ConfigAsset, ConfigObject, ConfigValue
 from apps.config_assets.services import get_resolved_config
@@ -29,6 +32,21 @@ def test_user(db, test_tenant):
     )
 
 
+@pytest.fixture(scope='class')
+def api_client():
+    """API client shared by every test in a class."""
+    return APIClient()
+
+
+@pytest.fixture
+def jwt_client(api_client, test_user):
+    """Shared client authenticated as ``test_user`` with a JWT access token."""
+    refresh = RefreshToken.for_user(test_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    yield api_client
+    api_client.credentials()
+
+
 @pytest.fixture
 def asset_with_many_objects(db, test_tenant, test_user):
     """Create an asset with multiple config objects and values."""
@@ -144,23 +162,15 @@ class TestConfigResolutionQueryCount:
 class TestAssetListQueryCount:
     """Tests for query count in asset list endpoints."""
     
-    def test_asset_list_bounded_queries(self, tenant_with_many_assets, test_user, client):
+    def test_asset_list_bounded_queries(self, tenant_with_many_assets, jwt_client):
         """
         Asset list endpoint query count documentation test.
         
         Note: The query count includes auth, session, pagination, and related queries.
         The important metric is that query count doesn't scale linearly with N assets.
         """
-        from rest_framework.test import APIClient
-        from rest_framework_simplejwt.tokens import RefreshToken
-        
-        # Authenticate
-        api_client = APIClient()
-        refresh = RefreshToken.for_user(test_user)
-        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
-        
         with CaptureQueriesContext(connection) as context:
-            response = api_client.get('/api/assets/')
+            response = jwt_client.get('/api/assets/')
         
         assert response.status_code == 200
         
@@ -173,23 +183,40 @@ class TestAssetListQueryCount:
         assert 'results' in response.data or isinstance(response.data, list)
 
 
+@pytest.mark.django_db
+class TestCLIAssetListQueryCount:
+    """Tests for query count in the CLI asset list endpoint."""
+
+    def cli_get(self, user, tenant):
+        client = APIClient()
+        client.force_authenticate(user=user, token=APIKey(tenant=tenant))
+        return client.get(f'/api/organizations/{tenant.slug}/assets/')
+
+    def test_objects_are_prefetched(self, tenant_with_many_assets, test_user, test_tenant):
+        """Objects for every asset come from one query, not one per asset."""
+        for asset in tenant_with_many_assets:
+            ConfigObject.objects.create(asset=asset, name='b_settings', object_type='kv')
+            ConfigObject.objects.create(asset=asset, name='a_settings', object_type='kv')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.cli_get(test_user, test_tenant)
+
+        assert response.status_code == 200
+        assert len(response.data['assets']) == 20
+        assert [obj['name'] for obj in response.data['assets'][0]['objects']] == ['a_settings', 'b_settings']
+        object_queries = [q for q in context.captured_queries if 'FROM "config_objects"' in q['sql']]
+        assert len(object_queries) == 1
+
 @pytest.mark.django_db
 class TestConfigObjectQueryCount:
     """Tests for query count in config object endpoints."""
     
-    def test_config_object_detail_bounded(self, asset_with_many_objects, test_user):
+    def test_config_object_detail_bounded(self, asset_with_many_objects, jwt_client):
         """Config object detail should include values without N+1."""
-        from rest_framework.test import APIClient
-        from rest_framework_simplejwt.tokens import RefreshToken
-        
         obj = asset_with_many_objects.config_objects.first()
         
-        api_client = APIClient()
-        refresh = RefreshToken.for_user(test_user)
-        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
-        
         with CaptureQueriesContext(connection) as context:
-            response = api_client.get(f'/api/config-objects/{obj.id}/?env=local')
+            response = jwt_client.get(f'/api/config-objects/{obj.id}/?env=local')
         
         # Should prefetch values, not query per value
         query_count = len(context)
@@ -202,17 +229,10 @@ class TestConfigObjectQueryCount:
 class TestSelectRelatedUsage:
     """Tests for proper use of select_related."""
     
-    def test_asset_serializer_includes_tenant(self, asset_with_many_objects, test_user):
+    def test_asset_serializer_includes_tenant(self, asset_with_many_objects, jwt_client):
         """Asset serializer should not cause extra query for tenant."""
-        from rest_framework.test import APIClient
-        from rest_framework_simplejwt.tokens import RefreshToken
-        
-        api_client = APIClient()
-        refresh = RefreshToken.for_user(test_user)
-        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
-        
         with CaptureQueriesContext(connection) as context:
-            response = api_client.get(f'/api/assets/{asset_with_many_objects.slug}/')
+            response = jwt_client.get(f'/api/assets/{asset_with_many_objects.slug}/')
         
         assert response.status_code == 200
         
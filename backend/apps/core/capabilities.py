@@ -1,3 +1,8 @@
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
 class CapabilityService:
     """
     Open Source Implementation:
@@ -13,3 +18,14 @@ class CapabilityService:
     def get_max_seats(tenant):
         # OSS allows unlimited seats effectively
         return 999999
+
+
+def get_capability_service():
+    """Return the CapabilityService class configured in settings.CAPABILITY_SERVICE."""
+    return _load_capability_service(settings.CAPABILITY_SERVICE)
+
+
+@lru_cache(maxsize=None)
+def _load_capability_service(path):
+    # Keyed on the dotted path, so overridden settings still take effect
+    return import_string(path)
@@ -0,0 +1,30 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+    
+    Output matches DRF's JSONRenderer: datetimes are passed back to DRF's
+    encoder so they keep its millisecond precision and 'Z' suffix, and
+    anything else orjson can't serialize (Decimal, lazy strings, ...) goes
+    through the same encoder. Indented (browsable) output falls back to
+    the stock renderer.
+    """
+    
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=self.options,
+        )
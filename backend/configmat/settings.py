@@ -120,7 +120,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.TenantJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -128,6 +128,10 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 50,
+    "DEFAULT_THROTTLE_RATES": {
+        "password_reset": "5/min",
+        "password_reset_confirm": "5/min",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -175,6 +179,18 @@ DRAMATIQ_BROKER = {
     ]
 }
 
+# Audit Logging
+# When enabled, log_activity() hands entries to the record_activity Dramatiq
+# actor, so the chain hash and INSERT happen on a worker instead of in the
+# request. Entries then appear once a worker has processed them.
+AUDIT_LOG_ASYNC = os.getenv('AUDIT_LOG_ASYNC', 'False') == 'True'
+
+# Transactional Email
+# When enabled, invitation emails are sent by the send_invitation_email_task
+# Dramatiq actor instead of calling Brevo during the request. Responses then
+# report the email as queued rather than whether it was sent.
+EMAIL_ASYNC = os.getenv('EMAIL_ASYNC', 'False') == 'True'
+
 # API Documentation
 SPECTACULAR_SETTINGS = {
     "TITLE": "ConfigMat API",
@@ -194,6 +210,11 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # If not set in production, the app will refuse to start
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY')
 
+# API Key Hashing
+# Secret for the HMAC that API keys are stored under. Changing it
+# invalidates every issued key.
+API_KEY_HASH_SECRET = os.getenv('API_KEY_HASH_SECRET', SECRET_KEY)
+
 # Swappable Capability Service (Open Core vs SaaS)
 # Default to Open Source (Permissive)
 CAPABILITY_SERVICE = "apps.core.capabilities.CapabilityService"